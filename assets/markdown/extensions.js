@@ -0,0 +1,171 @@
+/*
+ * marked extensions shared by runtime.js and worker.js, so the main thread
+ * and the worker turn a document into the same HTML.
+ *
+ * Math: $…$ / $$…$$ inline and $$ … $$ blocks become placeholders holding
+ * the escaped TeX (span.rx-math / div.rx-math.rx-math-display). The runtime
+ * typesets them with KaTeX after the document is shown, loading KaTeX only
+ * once a document contains a formula.
+ *
+ * Sanitizing: createSanitizer() returns the allowlist filter both apply to
+ * the parser's output, one regex pass per block (see below).
+ */
+
+// $$ on its own line(s): the whole block, up to a closing $$
+const MATH_BLOCK = /^ {0,3}\$\$([\s\S]+?)\$\$[ \t]*(?:\n+|$)/;
+// $tex$ or $$tex$$ inside a line; the TeX neither starts nor ends with a
+// space and the closing $ is not followed by a digit, so "$5 and $10" stays text
+const MATH_INLINE = /^(\$\$?)(?![\s$])((?:\\[\s\S]|[^\\\n$])+?)(?<!\s)\1(?![\d$])/;
+
+function escapeHtml(text) {
+    return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+}
+
+// Blocks get a div; inline formulas a span (also in display mode, since a
+// div would end the paragraph around it)
+export function mathHtml(tex, display, block) {
+    const tag = block ? 'div' : 'span';
+    const className = display ? 'rx-math rx-math-display' : 'rx-math';
+    return `<${tag} class="${className}">${escapeHtml(tex)}</${tag}>${block ? '\n' : ''}`;
+}
+
+const mathBlock = {
+    name: 'mathBlock',
+    level: 'block',
+    start(src) {
+        const match = /^ {0,3}\$\$/m.exec(src);
+        return match ? match.index : undefined;
+    },
+    tokenizer(src) {
+        const match = MATH_BLOCK.exec(src);
+        if (match && match[1].trim()) {
+            return { type: 'mathBlock', raw: match[0], text: match[1].trim() };
+        }
+    },
+    renderer(token) {
+        return mathHtml(token.text, true, true);
+    },
+};
+
+const mathInline = {
+    name: 'mathInline',
+    level: 'inline',
+    start(src) {
+        const index = src.indexOf('$');
+        return index < 0 ? undefined : index;
+    },
+    tokenizer(src) {
+        const match = MATH_INLINE.exec(src);
+        if (match) {
+            return { type: 'mathInline', raw: match[0], text: match[2], display: match[1].length === 2 };
+        }
+    },
+    renderer(token) {
+        return mathHtml(token.text, token.display, false);
+    },
+};
+
+// ---- Sanitizing -------------------------------------------------------------
+//
+// Markdown may carry raw HTML, so parser output is filtered against an
+// allowlist before it reaches innerHTML: one regex pass over the string,
+// rebuilding allowed tags with their allowed attributes, dropping other tags
+// (keeping their text), comments and script-like elements with their
+// content, and escaping any other "<". Link and image URLs must be relative
+// or use a safe scheme. The same rules apply in server mode
+// (components/sanitize.py).
+
+const BASE_TAGS = (
+    'a abbr b bdi bdo blockquote br caption cite code col colgroup dd del details dfn div dl dt em ' +
+    'figcaption figure h1 h2 h3 h4 h5 h6 hr i img input ins kbd li mark ol p pre q rp rt ruby s samp ' +
+    'small span strong sub summary sup table tbody td tfoot th thead tr u ul var wbr'
+).split(' ');
+const GLOBAL_ATTRIBUTES = ['class', 'title', 'lang', 'dir'];
+const TAG_ATTRIBUTES = {
+    a: ['href', 'name'],
+    img: ['src', 'alt', 'width', 'height'],
+    input: ['type', 'checked', 'disabled'],
+    ol: ['start', 'reversed', 'type'],
+    li: ['value'],
+    td: ['align', 'colspan', 'rowspan'],
+    th: ['align', 'colspan', 'rowspan', 'scope'],
+    col: ['span'],
+    colgroup: ['span'],
+    details: ['open'],
+    blockquote: ['cite'],
+    q: ['cite'],
+    del: ['cite', 'datetime'],
+    ins: ['cite', 'datetime'],
+};
+const URL_ATTRIBUTES = new Set(['href', 'src', 'cite']);
+const SAFE_SCHEME = /^(?:https?|mailto|tel):$/i;
+const SAFE_IMAGE_DATA = /^data:image\/(?:png|gif|jpe?g|webp|avif)[;,]/i;
+
+// Whitespace separating attributes, as in HTML (not \s, which also matches
+// Unicode spaces)
+const SPACE = String.raw`[\t\n\f\r ]`;
+
+// A comment, a script-like element with its content, a tag, or a stray "<"
+const HTML_TOKEN = new RegExp([
+    String.raw`<!--[\s\S]*?(?:-->|$)`,
+    String.raw`<(script|style|iframe|object|embed|noscript|template|textarea|title|xmp|noembed|noframes|plaintext)(?![\w-])[\s\S]*?(?:<\/\1${SPACE}*>|$)`,
+    String.raw`<(\/?)([a-zA-Z][\w-]*)((?:${SPACE}+[^\t\n\f\r "'>\/=]+(?:${SPACE}*=${SPACE}*(?:"[^"]*"|'[^']*'|[^\t\n\f\r "'=<>\x60]+))?)*)${SPACE}*\/?>`,
+    '<',
+].join('|'), 'gi');
+const ATTRIBUTE = new RegExp(
+    String.raw`([^\t\n\f\r "'>\/=]+)(?:${SPACE}*=${SPACE}*(?:"([^"]*)"|'([^']*)'|([^\t\n\f\r "'=<>\x60]+)))?`, 'g');
+
+// Character references a scheme can be hidden behind: numeric ones and the
+// named colon, tab and newline (";" optional). Others cannot produce a
+// scheme character, so they are left as they are
+function decodeEntities(text) {
+    return text.replace(/&(?:#(\d+)|#x([0-9a-f]+)|(colon|tab|newline));?/gi, (entity, decimal, hex, name) => {
+        if (name) return name.toLowerCase() === 'colon' ? ':' : '';
+        const code = decimal ? Number(decimal) : parseInt(hex, 16);
+        return code > 0x10ffff ? '\ufffd' : String.fromCodePoint(code);
+    });
+}
+
+function safeUrl(value, name) {
+    // Browsers ignore control characters and whitespace inside a scheme
+    const url = decodeEntities(value).replace(/[\u0000-\u0020\u007f]/g, '');
+    const end = url.search(/[:/?#]/);
+    // Relative URL
+    if (end < 0 || url[end] !== ':') return true;
+    return SAFE_SCHEME.test(url.slice(0, end + 1)) || (name === 'src' && SAFE_IMAGE_DATA.test(url));
+}
+
+function cleanAttributes(tag, source) {
+    const allowed = TAG_ATTRIBUTES[tag];
+    let result = '';
+    ATTRIBUTE.lastIndex = 0;
+    let match;
+    while ((match = ATTRIBUTE.exec(source))) {
+        const name = match[1].toLowerCase();
+        if (!GLOBAL_ATTRIBUTES.includes(name) && !(allowed && allowed.includes(name))) continue;
+        const value = match[2] ?? match[3] ?? match[4];
+        if (value === undefined) {
+            result += ` ${name}`;
+        } else if (!URL_ATTRIBUTES.has(name) || safeUrl(value, name)) {
+            result += ` ${name}="${value.replace(/"/g, '&quot;')}"`;
+        }
+    }
+    return result;
+}
+
+// Filter for parser output allowing the base tags plus ``customTags``
+// (e.g. ['thinking'])
+export function createSanitizer(customTags = []) {
+    const tags = new Set(BASE_TAGS.concat(customTags.map((tag) => tag.toLowerCase())));
+    return (html) => html.replace(HTML_TOKEN, (token, dropped, closing, name, attributes) => {
+        if (token === '<') return '&lt;';
+        if (dropped !== undefined || name === undefined) return '';
+        const tag = name.toLowerCase();
+        if (!tags.has(tag)) return '';
+        return closing ? `</${tag}>` : `<${tag}${cleanAttributes(tag, attributes)}>`;
+    });
+}
+
+export default function useExtensions(marked) {
+    marked.use({ extensions: [mathBlock, mathInline] });
+}
@@ -0,0 +1,1564 @@
+/*
+ * Client runtime shared by the reflex-markdown components.
+ *
+ * Loaded once per page (see components/runtime.py:markdown_head). Instances
+ * never import the parser themselves: they push a job onto
+ * window.ReflexMarkdownQueue, which runs immediately once this file has
+ * loaded, and every job shares a single marked.js load.
+ */
+(function () {
+    if (window.ReflexMarkdown) return;
+
+    const script = document.currentScript || document.querySelector('script[data-marked-url]');
+    const config = {
+        markedUrl: (script && script.dataset.markedUrl) || 'https://esm.sh/marked@12.0.0',
+        workerUrl: (script && script.dataset.workerUrl) || (script && script.src ? new URL('worker.js', script.src).href : null),
+        // marked extensions module shared with the worker (extensions.js)
+        extensionsUrl: (script && script.dataset.extensionsUrl) || (script && script.src ? new URL('extensions.js', script.src).href : null),
+        // Size cap of the persistent render cache (UTF-16 code units); 0 disables it
+        cacheBytes: script && script.dataset.cacheBytes !== undefined ? Number(script.dataset.cacheBytes) : 50 * 1024 * 1024,
+        // How far outside the viewport lazy instances start rendering
+        lazyMargin: (script && script.dataset.lazyMargin) || '200px',
+        // Directory holding highlight.js core.min.js and languages/; no highlighting without it
+        highlightUrl: (script && script.dataset.highlightUrl) || null,
+        // Directory holding KaTeX's katex.mjs and katex.min.css; no math typesetting without it
+        katexUrl: (script && script.dataset.katexUrl) || null,
+        // Mermaid ES module URL; ```mermaid blocks stay code without it
+        mermaidUrl: (script && script.dataset.mermaidUrl) || null,
+        // Filter parser output through the allowlist sanitizer (extensions.js)
+        sanitize: !(script && script.dataset.sanitize === 'off'),
+        // Tags allowed on top of the sanitizer's standard set
+        customTags: ((script && script.dataset.customTags) ?? 'thinking').split(',').map((tag) => tag.trim()).filter(Boolean),
+    };
+
+    let markedPromise = null;
+    // Sanitizer for parser output; identity until extensions.js is loaded
+    let clean = (html) => html;
+
+    // One load for the whole page, however many instances mount at once
+    function loadMarked() {
+        if (!markedPromise) {
+            markedPromise = Promise.all([
+                import(config.markedUrl),
+                config.extensionsUrl ? import(config.extensionsUrl) : null,
+            ]).then(([module, extensions]) => {
+                const marked = module.marked;
+                marked.setOptions({
+                    breaks: true,
+                    gfm: true,
+                });
+                if (extensions) {
+                    extensions.default(marked);
+                    if (config.sanitize) clean = extensions.createSanitizer(config.customTags);
+                }
+                window.marked = marked;
+                return marked;
+            });
+            // Allow a later render to retry after a failed load
+            markedPromise.catch(() => {
+                markedPromise = null;
+            });
+        }
+        return markedPromise;
+    }
+
+    function showError(container, error) {
+        console.error('Markdown rendering error:', error);
+        const box = document.createElement('div');
+        box.className = 'error';
+        box.innerHTML = '<strong>渲染错误:</strong> ';
+        box.append((error && error.message) || '未知错误');
+        container.replaceChildren(box);
+    }
+
+    // ---- Incremental block rendering -------------------------------------
+    //
+    // A rendered document is kept as the list of its top-level blocks (the
+    // lexer's top-level tokens), each with its source and the DOM nodes it
+    // produced. On update only the blocks touched by the edit are re-lexed,
+    // re-parsed and swapped, so unchanged nodes (and scroll position and
+    // selection inside them) survive.
+
+    const blockStates = new WeakMap();
+    // Containers showing a document that could not be split into blocks
+    const plainRenders = new WeakSet();
+    const BLOCK_SEPARATOR = '<!--rx-md-block-->';
+    // Anything that may be a link reference definition (also nested in lists/quotes)
+    const DEFINITION = /\]:/;
+
+    // Apply the lexer's own line-ending normalisation up front so that the raw
+    // source of the top-level tokens concatenates back to exactly the input
+    // (lex() checks this and callers fall back to a plain render otherwise)
+    function normalize(content) {
+        return content.replace(/\r\n|\r/g, '\n');
+    }
+
+    function lex(marked, src, links) {
+        const lexer = new marked.Lexer();
+        if (links) Object.assign(lexer.tokens.links, links);
+        const tokens = lexer.lex(src);
+        let length = 0;
+        for (const token of tokens) length += token.raw.length;
+        return length === src.length ? tokens : null;
+    }
+
+    // Put the HTML of each block (``html``) into ``target`` (an element or a
+    // template), grouping the resulting nodes per block; null if the HTML of
+    // one block spills into another (e.g. an HTML block spanning blank lines)
+    function buildNodes(html, target) {
+        target.innerHTML = html.map((block) => block + BLOCK_SEPARATOR).join('');
+        const groups = [];
+        let nodes = [];
+        for (const node of Array.from((target.content || target).childNodes)) {
+            if (node.nodeType === Node.COMMENT_NODE && node.data === 'rx-md-block') {
+                groups.push(nodes);
+                nodes = [];
+                node.remove();
+            } else {
+                nodes.push(node);
+            }
+        }
+        return groups.length === html.length && nodes.length === 0 ? groups : null;
+    }
+
+    function parseBlocks(marked, tokens) {
+        return tokens.map((token) => clean(marked.parser([token])));
+    }
+
+    // Block records for blocks with source ``raws`` starting at ``start``
+    function toBlocks(raws, groups, start) {
+        let offset = start;
+        return raws.map((raw, index) => {
+            const block = { raw, space: !raw.trim(), start: offset, nodes: groups[index] };
+            offset += raw.length;
+            return block;
+        });
+    }
+
+    // Containers by the document they were last fully rendered from, so that
+    // another instance showing the same document clones their nodes instead
+    // of parsing it again. Entries are checked on use, oldest dropped first.
+    const rendered = new Map();
+    const MAX_RENDERED = 64;
+
+    function register(container, src) {
+        if (typeof WeakRef !== 'function') return;
+        rendered.delete(src);
+        rendered.set(src, new WeakRef(container));
+        if (rendered.size > MAX_RENDERED) rendered.delete(rendered.keys().next().value);
+    }
+
+    function cloneRendered(container, src) {
+        const ref = rendered.get(src);
+        const source = ref && ref.deref();
+        const state = source && source !== container && blockStates.get(source);
+        if (!state || state.src !== src || !source.isConnected || source.childNodes.length !== state.nodeCount) {
+            return false;
+        }
+        const blocks = state.blocks.map((block) => ({ ...block, nodes: block.nodes.map((node) => node.cloneNode(true)) }));
+        container.replaceChildren(...blocks.flatMap((block) => block.nodes));
+        blockStates.set(container, { src, links: { ...state.links }, blocks, nodeCount: state.nodeCount });
+        return true;
+    }
+
+    // Render a document from its block sources and HTML; raws is null when
+    // it could not be split into blocks
+    function showBlocks(container, src, links, raws, html) {
+        const groups = raws && buildNodes(html, container);
+        if (!groups) {
+            // Not splittable into independent blocks: plain render, no state
+            blockStates.delete(container);
+            plainRenders.add(container);
+            container.innerHTML = html.join('');
+            return;
+        }
+        blockStates.set(container, {
+            src,
+            links: { ...links },
+            blocks: toBlocks(raws, groups, 0),
+            nodeCount: container.childNodes.length,
+        });
+        register(container, src);
+    }
+
+    // Returns the HTML of each block, or null if the nodes were cloned
+    function fullRender(marked, container, src) {
+        if (cloneRendered(container, src)) return null;
+        const tokens = lex(marked, src);
+        const html = tokens ? parseBlocks(marked, tokens) : [clean(marked.parse(src))];
+        showBlocks(container, src, tokens && tokens.links, tokens && tokens.map((token) => token.raw), html);
+        return html;
+    }
+
+    // Index of the block containing ``offset`` (binary search on start offsets)
+    function findBlock(blocks, offset) {
+        let low = 0;
+        let high = blocks.length - 1;
+        while (low < high) {
+            const mid = (low + high + 1) >> 1;
+            if (blocks[mid].start <= offset) low = mid;
+            else high = mid - 1;
+        }
+        return low;
+    }
+
+    // Patch the rendered blocks from ``state.src`` to ``src``, which share
+    // their first ``prefix`` and last ``suffix`` characters; false if the
+    // document has to be rendered in full instead
+    function updateBlocks(marked, container, state, src, prefix, suffix) {
+        const prev = state.src;
+        const blocks = state.blocks;
+        if (!blocks.length || container.childNodes.length !== state.nodeCount) return false;
+        const delta = src.length - prev.length;
+
+        // Start before the edit, at the beginning of the run of blocks not
+        // separated by blank lines: an edit can merge blocks into their
+        // predecessors (lazy continuation, setext underlines, list items
+        // separated by blank lines)
+        let first = Math.max(0, findBlock(blocks, prefix) - 1);
+        while (first > 0 && blocks[first].space) first--;
+        while (first > 0 && !blocks[first - 1].space) first--;
+        let end = findBlock(blocks, Math.max(prefix, prev.length - suffix - 1)) + 1;
+        const start = blocks[first].start;
+
+        // Re-lex the edited region together with the following run of blocks
+        // not separated by blank lines, growing the region until that run
+        // lexes exactly as before (e.g. an opened code fence swallows the
+        // following blocks until it is closed, a list absorbs items after
+        // blank lines, a paragraph turns into a setext heading)
+        let tokens;
+        for (;;) {
+            let check = end;
+            while (check < blocks.length && blocks[check].space) check++;
+            while (check + 1 < blocks.length && !blocks[check + 1].space) check++;
+            const next = blocks[check];
+            const oldEnd = end < blocks.length ? blocks[end].start : prev.length;
+            const newEnd = oldEnd + delta;
+            const text = src.slice(start, next ? next.start + next.raw.length + delta : src.length);
+            // Reference definitions affect links anywhere in the document
+            if (DEFINITION.test(text) || DEFINITION.test(prev.slice(start, oldEnd))) return false;
+            tokens = lex(marked, text, state.links);
+            if (!tokens) return false;
+            if (!next) {
+                end = blocks.length;
+                break;
+            }
+            const kept = check - end + 1;
+            let same = tokens.length >= kept;
+            for (let index = 1; same && index <= kept; index++) {
+                same = tokens[tokens.length - index].raw === blocks[check + 1 - index].raw;
+            }
+            if (same && newEnd >= start) {
+                tokens.length -= kept;
+                break;
+            }
+            end = check + 1;
+        }
+
+        const raws = tokens.map((token) => token.raw);
+        if (!spliceBlocks(container, state, first, end, raws, (from, to) => parseBlocks(marked, tokens.slice(from, to)))) {
+            return false;
+        }
+        state.src = src;
+        return true;
+    }
+
+    // Replace ``state.blocks[first, end)`` by blocks with source ``raws``,
+    // keeping the nodes of those whose source did not change; ``toHtml(from,
+    // to)`` returns the HTML of ``raws[from, to)``
+    function spliceBlocks(container, state, first, end, raws, toHtml) {
+        const blocks = state.blocks;
+        const start = first < blocks.length ? blocks[first].start : 0;
+        const replaced = blocks.slice(first, end);
+        let head = 0;
+        while (head < raws.length && head < replaced.length && raws[head] === replaced[head].raw) head++;
+        let tail = 0;
+        while (tail < raws.length - head && tail < replaced.length - head
+            && raws[raws.length - 1 - tail] === replaced[replaced.length - 1 - tail].raw) tail++;
+        const changed = raws.slice(head, raws.length - tail);
+        const removed = replaced.slice(head, replaced.length - tail);
+
+        const template = document.createElement('template');
+        const groups = buildNodes(toHtml(head, raws.length - tail), template);
+        if (!groups) return false;
+
+        let anchor = null;
+        for (let index = first + head + removed.length; index < blocks.length && !anchor; index++) {
+            anchor = blocks[index].nodes[0] || null;
+        }
+        let removedCount = 0;
+        for (const block of removed) {
+            removedCount += block.nodes.length;
+            block.nodes.forEach((node) => node.remove());
+        }
+        container.insertBefore(template.content, anchor);
+
+        blocks.splice(first + head, removed.length, ...toBlocks(changed, groups, 0));
+        let offset = start;
+        for (let index = first; index < blocks.length; index++) {
+            blocks[index].start = offset;
+            offset += blocks[index].raw.length;
+        }
+        state.nodeCount += groups.reduce((count, nodes) => count + nodes.length, 0) - removedCount;
+        return true;
+    }
+
+    // Returns the HTML of each block if the document was rendered in full
+    function renderBlocks(marked, container, content) {
+        const src = normalize(content);
+        const state = blockStates.get(container);
+        if (state && state.src === src) return null;
+        if (state) {
+            const prev = state.src;
+            const min = Math.min(prev.length, src.length);
+            let prefix = 0;
+            while (prefix < min && prev.charCodeAt(prefix) === src.charCodeAt(prefix)) prefix++;
+            let suffix = 0;
+            while (suffix < min - prefix
+                && prev.charCodeAt(prev.length - 1 - suffix) === src.charCodeAt(src.length - 1 - suffix)) suffix++;
+            if (updateBlocks(marked, container, state, src, prefix, suffix)) return null;
+        }
+        return fullRender(marked, container, src);
+    }
+
+    // ---- Streaming ---------------------------------------------------------
+    //
+    // A stream only ever grows at the end, so appends skip the diff: the
+    // deltas received during a frame are joined and only the last run of
+    // blocks is re-lexed, while finished blocks keep their nodes. The cost of
+    // a token depends on the size of the open block, not of the answer.
+
+    const streams = new WeakMap();
+
+    function append(container, delta) {
+        if (!container || !delta) return;
+        let stream = streams.get(container);
+        if (!stream) {
+            stream = { src: '', pending: '', scheduled: false };
+            streams.set(container, stream);
+            blockStates.delete(container);
+        }
+        stream.pending += delta;
+        if (!stream.scheduled) {
+            stream.scheduled = true;
+            requestAnimationFrame(() => flushStream(container, stream));
+        }
+    }
+
+    async function flushStream(container, stream) {
+        stream.scheduled = false;
+        let marked;
+        try {
+            marked = await loadMarked();
+        } catch (error) {
+            showError(container, error);
+            return;
+        }
+        // Reset while the parser was loading
+        if (streams.get(container) !== stream) return;
+
+        // Hold back a trailing CR, it may be the first half of a CRLF
+        let delta = stream.pending;
+        const held = delta.endsWith('\r') ? '\r' : '';
+        stream.pending = held;
+        delta = normalize(held ? delta.slice(0, -1) : delta);
+        if (!delta) return;
+
+        const prefix = stream.src.length;
+        stream.src += delta;
+        const state = blockStates.get(container);
+        try {
+            if (!(state && state.src.length === prefix && updateBlocks(marked, container, state, stream.src, prefix, 0))) {
+                fullRender(marked, container, stream.src);
+            }
+            enhance(container);
+        } catch (error) {
+            blockStates.delete(container);
+            showError(container, error);
+        }
+    }
+
+    // Start the stream in ``container`` over, from ``content``
+    function reset(container, content) {
+        if (!container) return;
+        streams.delete(container);
+        blockStates.delete(container);
+        container.replaceChildren();
+        if (content) append(container, content);
+    }
+
+    // ---- Worker mode -------------------------------------------------------
+    //
+    // With { worker: true } documents are parsed in one Web Worker shared by
+    // every instance on the page (assets/markdown/worker.js), which posts back
+    // the HTML of each top-level block; the main thread only swaps the nodes
+    // of blocks that changed. Results for content that has since been
+    // replaced are dropped, so a container only ever shows its latest text.
+
+    let worker = null;
+    let workerSeq = 0;
+    const workerKeys = new WeakMap();
+    // Container key -> its latest job { container, src, seq, resolve }
+    const workerJobs = new Map();
+
+    function getWorker() {
+        if (worker === null) {
+            worker = false;
+            if (config.workerUrl && window.Worker) {
+                try {
+                    worker = new Worker(config.workerUrl, { type: 'module' });
+                    worker.onmessage = onWorkerMessage;
+                    worker.onerror = onWorkerError;
+                    worker.postMessage({
+                        type: 'init',
+                        markedUrl: new URL(config.markedUrl, location.href).href,
+                        extensionsUrl: config.extensionsUrl && new URL(config.extensionsUrl, location.href).href,
+                        customTags: config.sanitize ? config.customTags : null,
+                    });
+                } catch (error) {
+                    console.warn('Markdown worker unavailable, parsing on the main thread:', error);
+                    worker = false;
+                }
+            }
+        }
+        return worker;
+    }
+
+    function onWorkerError(event) {
+        console.warn('Markdown worker failed, parsing on the main thread:', event.message || event);
+        worker.terminate();
+        worker = false;
+        const jobs = Array.from(workerJobs.values());
+        workerJobs.clear();
+        jobs.forEach((job) => render(job.container, job.src).then(job.resolve));
+    }
+
+    // Forget the job still in flight for ``container``; its result is dropped
+    function cancelWorkerJob(container) {
+        const key = workerKeys.get(container);
+        const job = key && workerJobs.get(key);
+        if (job) {
+            workerJobs.delete(key);
+            job.resolve();
+        }
+        return key;
+    }
+
+    // ``cacheKey``: store the result in the render cache under that key
+    function renderInWorker(container, content, cacheKey) {
+        const src = normalize(content);
+        let key = cancelWorkerJob(container);
+        const state = blockStates.get(container);
+        if ((state && state.src === src) || cloneRendered(container, src)) return Promise.resolve();
+        if (!key) {
+            key = `md-${++workerSeq}`;
+            workerKeys.set(container, key);
+        }
+        if (!container.hasChildNodes()) {
+            container.innerHTML = '<div class="loading">正在加载 Markdown...</div>';
+        }
+        return new Promise((resolve) => {
+            const job = { container, src, seq: ++workerSeq, resolve, cacheKey };
+            workerJobs.set(key, job);
+            worker.postMessage({ type: 'render', key, seq: job.seq, content: src });
+        });
+    }
+
+    function onWorkerMessage(event) {
+        const result = event.data;
+        const job = workerJobs.get(result.key);
+        // Stale: the container got newer content (or a main-thread render)
+        if (!job || job.seq !== result.seq) return;
+        workerJobs.delete(result.key);
+
+        const { container, src } = job;
+        try {
+            if (result.error) throw new Error(result.error);
+            if (job.cacheKey) cachePut(job.cacheKey, result.html.join(''));
+            const state = blockStates.get(container);
+            // Unchanged blocks keep their nodes unless the link definitions
+            // they may refer to changed
+            if (state && result.raws && container.childNodes.length === state.nodeCount
+                && JSON.stringify(state.links) === JSON.stringify(result.links)
+                && spliceBlocks(container, state, 0, state.blocks.length, result.raws,
+                    (from, to) => result.html.slice(from, to))) {
+                state.src = src;
+            } else {
+                showBlocks(container, src, result.links, result.raws, result.html);
+            }
+            enhance(container);
+        } catch (error) {
+            blockStates.delete(container);
+            showError(container, error);
+        }
+        job.resolve();
+    }
+
+    // ---- Virtualized rendering ----------------------------------------------
+    //
+    // With { virtual: true } only the top-level blocks near the viewport are
+    // in the DOM, between two spacers standing in for the blocks above and
+    // below. Block heights are estimated from their source until the block
+    // has been on screen, then measured once and cached by source, so the
+    // scrollbar reflects the whole document while the DOM, memory and layout
+    // work stay bounded by the viewport whatever the document length.
+
+    const virtualStates = new WeakMap();
+    // Viewports rendered ahead above and below the visible one
+    const OVERSCAN = 1;
+
+    function estimateHeight(raw) {
+        if (!raw.trim()) return 0;
+        let lines = 1;
+        for (let index = raw.indexOf('\n'); index !== -1 && index < raw.length - 1; index = raw.indexOf('\n', index + 1)) {
+            lines++;
+        }
+        return 16 + 24 * lines;
+    }
+
+    function createSpacer() {
+        const spacer = document.createElement('div');
+        spacer.className = 'rx-md-spacer';
+        spacer.setAttribute('aria-hidden', 'true');
+        return spacer;
+    }
+
+    function renderVirtual(marked, container, src) {
+        let state = virtualStates.get(container);
+        if (state && state.src === src) return;
+        if (!state) {
+            state = {
+                container,
+                marked,
+                top: createSpacer(),
+                bottom: createSpacer(),
+                heights: new Map(),
+                width: container.clientWidth,
+                scheduled: false,
+                onScroll: () => scheduleVirtual(state),
+            };
+            virtualStates.set(container, state);
+            document.addEventListener('scroll', state.onScroll, { capture: true, passive: true });
+            window.addEventListener('resize', state.onScroll, { passive: true });
+        }
+        blockStates.delete(container);
+        container.replaceChildren(state.top, state.bottom);
+
+        // Block level only: inline content is lexed when a block is shown
+        const lexer = new marked.Lexer();
+        const tokens = lexer.blockTokens(src, lexer.tokens);
+        state.src = src;
+        state.raws = tokens.map((token) => token.raw);
+        state.links = { ...lexer.tokens.links };
+        state.sizes = state.raws.map((raw) => {
+            const height = state.heights.get(raw);
+            return height !== undefined ? height : estimateHeight(raw);
+        });
+        state.offsets = null;
+        state.first = 0;
+        state.end = 0;
+        state.nodes = [];
+        layoutVirtual(state);
+    }
+
+    function stopVirtual(container) {
+        const state = virtualStates.get(container);
+        if (!state) return;
+        virtualStates.delete(container);
+        document.removeEventListener('scroll', state.onScroll, { capture: true });
+        window.removeEventListener('resize', state.onScroll);
+    }
+
+    function scheduleVirtual(state) {
+        if (state.scheduled) return;
+        state.scheduled = true;
+        requestAnimationFrame(() => {
+            state.scheduled = false;
+            if (virtualStates.get(state.container) !== state) return;
+            if (!state.container.isConnected) {
+                stopVirtual(state.container);
+                return;
+            }
+            layoutVirtual(state);
+        });
+    }
+
+    // Offset of the top of each block from the top of the document
+    function virtualOffsets(state) {
+        if (!state.offsets) {
+            const offsets = new Float64Array(state.sizes.length + 1);
+            for (let index = 0; index < state.sizes.length; index++) {
+                offsets[index + 1] = offsets[index] + state.sizes[index];
+            }
+            state.offsets = offsets;
+        }
+        return state.offsets;
+    }
+
+    // First index whose offset is above ``y`` (binary search)
+    function blockAt(offsets, y) {
+        let low = 0;
+        let high = offsets.length - 2;
+        while (low < high) {
+            const mid = (low + high + 1) >> 1;
+            if (offsets[mid] <= y) low = mid;
+            else high = mid - 1;
+        }
+        return Math.max(0, low);
+    }
+
+    // Nodes of blocks [from, to), grouped per block, and a fragment holding
+    // them all. Each block is parsed into its own template so that HTML left
+    // open by one block cannot spill into the next.
+    function virtualBlockNodes(state, from, to) {
+        const fragment = document.createDocumentFragment();
+        const template = document.createElement('template');
+        const nodes = [];
+        for (let index = from; index < to; index++) {
+            const lexer = new state.marked.Lexer();
+            Object.assign(lexer.tokens.links, state.links);
+            template.innerHTML = clean(state.marked.parser(lexer.lex(state.raws[index])));
+            nodes.push(Array.from(template.content.childNodes));
+            fragment.append(template.content);
+        }
+        return { nodes, fragment };
+    }
+
+    function layoutVirtual(state) {
+        const { container } = state;
+        if (container.clientWidth !== state.width) {
+            // Wrapping changed: measurements no longer hold
+            state.width = container.clientWidth;
+            state.heights.clear();
+            state.sizes = state.raws.map(estimateHeight);
+            state.offsets = null;
+        }
+
+        const offsets = virtualOffsets(state);
+        const count = state.raws.length;
+        const rect = container.getBoundingClientRect();
+        const viewport = window.innerHeight || document.documentElement.clientHeight;
+        const first = blockAt(offsets, -rect.top - viewport * OVERSCAN);
+        let end = blockAt(offsets, -rect.top + viewport * (1 + OVERSCAN)) + 1;
+        end = Math.min(count, Math.max(end, first + 1));
+        if (first === state.first && end === state.end) return;
+
+        // Drop the blocks leaving the range, add those entering it
+        const keepFirst = Math.max(first, state.first);
+        const keepEnd = Math.min(end, state.end);
+        const kept = keepFirst < keepEnd ? state.nodes.slice(keepFirst - state.first, keepEnd - state.first) : [];
+        state.nodes.forEach((nodes, index) => {
+            const block = state.first + index;
+            if (block < keepFirst || block >= keepEnd || !kept.length) nodes.forEach((node) => node.remove());
+        });
+        let before = [];
+        let after = [];
+        if (kept.length) {
+            if (first < keepFirst) {
+                const built = virtualBlockNodes(state, first, keepFirst);
+                before = built.nodes;
+                container.insertBefore(built.fragment, state.top.nextSibling);
+            }
+            if (keepEnd < end) {
+                const built = virtualBlockNodes(state, keepEnd, end);
+                after = built.nodes;
+                container.insertBefore(built.fragment, state.bottom);
+            }
+        } else {
+            const built = virtualBlockNodes(state, first, end);
+            after = built.nodes;
+            container.insertBefore(built.fragment, state.bottom);
+        }
+        state.nodes = before.concat(kept, after);
+        state.first = first;
+        state.end = end;
+        state.top.style.height = `${offsets[first]}px`;
+        state.bottom.style.height = `${offsets[count] - offsets[end]}px`;
+        enhance(container);
+
+        // Measure the blocks shown for the first time, bottom up: a block
+        // reaches from its first element to the next block's
+        let next = state.bottom.getBoundingClientRect().top;
+        let changed = false;
+        for (let index = end - 1; index >= first; index--) {
+            const element = state.nodes[index - first].find((node) => node.nodeType === Node.ELEMENT_NODE);
+            const top = element ? element.getBoundingClientRect().top : next;
+            const raw = state.raws[index];
+            if (!state.heights.has(raw)) {
+                const height = Math.max(0, next - top);
+                state.heights.set(raw, height);
+                if (height !== state.sizes[index]) {
+                    state.sizes[index] = height;
+                    changed = true;
+                }
+            }
+            next = top;
+        }
+        if (changed) {
+            state.offsets = null;
+            // The range may need to grow or shrink with the real heights
+            scheduleVirtual(state);
+        }
+    }
+
+    // ---- Persistent render cache -------------------------------------------
+    //
+    // The HTML of documents rendered from scratch is kept in IndexedDB, keyed
+    // by a digest of the source and the renderer version (parser build and
+    // options), behind a synchronous in-memory tier. A revisited document
+    // paints from the cache without loading or running the parser. Both
+    // tiers are size-capped and evict the least recently used entries.
+
+    const RENDER_VERSION = `3|${config.markedUrl}|${config.extensionsUrl}|breaks|gfm|${config.sanitize ? config.customTags : 'raw'}`;
+    const MEMORY_CACHE_BYTES = 8 * 1024 * 1024;
+    const memoryCache = new Map();
+    let memoryCacheBytes = 0;
+    let cacheDb = null;
+    let trimTimer = null;
+    // Containers showing cached HTML (no block state) -> their source
+    const cachedSources = new WeakMap();
+
+    // 128-bit digest of a string (cyrb128); not cryptographic, but more than
+    // enough to tell documents apart
+    function digest(text) {
+        let h1 = 1779033703, h2 = 3144134277, h3 = 1013904242, h4 = 2773480762;
+        for (let index = 0; index < text.length; index++) {
+            const code = text.charCodeAt(index);
+            h1 = h2 ^ Math.imul(h1 ^ code, 597399067);
+            h2 = h3 ^ Math.imul(h2 ^ code, 2869860233);
+            h3 = h4 ^ Math.imul(h3 ^ code, 951274213);
+            h4 = h1 ^ Math.imul(h4 ^ code, 2716044179);
+        }
+        h1 = Math.imul(h3 ^ (h1 >>> 18), 597399067);
+        h2 = Math.imul(h4 ^ (h2 >>> 22), 2869860233);
+        h3 = Math.imul(h1 ^ (h3 >>> 17), 951274213);
+        h4 = Math.imul(h2 ^ (h4 >>> 19), 2716044179);
+        h1 ^= h2 ^ h3 ^ h4;
+        h2 ^= h1;
+        h3 ^= h1;
+        h4 ^= h1;
+        return [h1, h2, h3, h4].map((h) => (h >>> 0).toString(16).padStart(8, '0')).join('') + text.length.toString(16);
+    }
+
+    function openCacheDb() {
+        if (cacheDb === null) {
+            cacheDb = new Promise((resolve) => {
+                if (!window.indexedDB) return resolve(null);
+                const request = indexedDB.open('reflex-markdown', 1);
+                request.onupgradeneeded = () => {
+                    const store = request.result.createObjectStore('renders', { keyPath: 'key' });
+                    store.createIndex('used', 'used');
+                };
+                request.onsuccess = () => resolve(request.result);
+                // Private browsing, storage disabled...: memory tier only
+                request.onerror = () => resolve(null);
+            });
+        }
+        return cacheDb;
+    }
+
+    function rememberHtml(key, html) {
+        const known = memoryCache.get(key);
+        if (known !== undefined) {
+            memoryCache.delete(key);
+            memoryCacheBytes -= known.length;
+        }
+        if (html.length > MEMORY_CACHE_BYTES) return;
+        memoryCache.set(key, html);
+        memoryCacheBytes += html.length;
+        for (const [oldest, value] of memoryCache) {
+            if (memoryCacheBytes <= MEMORY_CACHE_BYTES) break;
+            memoryCache.delete(oldest);
+            memoryCacheBytes -= value.length;
+        }
+    }
+
+    // Memory tier only, bumping the entry to most recently used
+    function cacheGetSync(key) {
+        const html = memoryCache.get(key);
+        if (html !== undefined) rememberHtml(key, html);
+        return html;
+    }
+
+    async function cacheGet(key) {
+        const html = cacheGetSync(key);
+        if (html !== undefined) return html;
+        const db = await openCacheDb();
+        if (!db) return undefined;
+        return new Promise((resolve) => {
+            const store = db.transaction('renders', 'readwrite').objectStore('renders');
+            const request = store.get(key);
+            request.onsuccess = () => {
+                const entry = request.result;
+                if (!entry) return resolve(undefined);
+                entry.used = Date.now();
+                store.put(entry);
+                rememberHtml(key, entry.html);
+                resolve(entry.html);
+            };
+            request.onerror = () => resolve(undefined);
+        });
+    }
+
+    async function cachePut(key, html) {
+        if (!config.cacheBytes || html.length > config.cacheBytes) return;
+        rememberHtml(key, html);
+        const db = await openCacheDb();
+        if (!db) return;
+        db.transaction('renders', 'readwrite').objectStore('renders')
+            .put({ key, html, size: html.length, used: Date.now() });
+        clearTimeout(trimTimer);
+        trimTimer = setTimeout(() => trimCache(db), 2000);
+    }
+
+    // Drop the least recently used entries beyond the size cap
+    function trimCache(db) {
+        let total = 0;
+        const request = db.transaction('renders', 'readwrite').objectStore('renders').index('used').openCursor(null, 'prev');
+        request.onsuccess = () => {
+            const cursor = request.result;
+            if (!cursor) return;
+            total += cursor.value.size;
+            if (total > config.cacheBytes) cursor.delete();
+            cursor.continue();
+        };
+    }
+
+    // Show ``src`` from the render cache if it is there; returns whether it
+    // was, or null when ``token`` is no longer the container's latest render
+    async function paintFromCache(container, src, key, token) {
+        let html = cacheGetSync(key);
+        if (html === undefined) {
+            html = await cacheGet(key);
+            if (renderTokens.get(container) !== token) return null;
+        }
+        if (html === undefined) return false;
+        blockStates.delete(container);
+        container.innerHTML = html;
+        cachedSources.set(container, src);
+        return true;
+    }
+
+    // ---- Render scheduler --------------------------------------------------
+    //
+    // First renders from every instance on the page share one queue, worked
+    // off in slices of at most SLICE_BUDGET ms per idle period (or animation
+    // frame where requestIdleCallback is missing), containers near the
+    // viewport first. Hundreds of instances mounting together become a run
+    // of short tasks instead of one long one; a lone render still runs at once.
+
+    const SLICE_BUDGET = 8;
+    // Container -> { job, resolve, reject } waiting for a slice
+    const scheduledJobs = new Map();
+    let sliceRequested = false;
+    // Time spent on jobs run straight away in the current task
+    let inlineSpent = 0;
+    let inlineReset = false;
+
+    // Run ``job`` (a synchronous render) for ``container`` now if the current
+    // task still has budget, otherwise in a later slice. A newer job for the
+    // same container replaces a waiting one, which then resolves undefined.
+    function schedule(container, job) {
+        if (!scheduledJobs.size && inlineSpent < SLICE_BUDGET) {
+            const started = performance.now();
+            try {
+                return Promise.resolve(job());
+            } catch (error) {
+                return Promise.reject(error);
+            } finally {
+                inlineSpent += performance.now() - started;
+                if (!inlineReset) {
+                    inlineReset = true;
+                    setTimeout(() => {
+                        inlineSpent = 0;
+                        inlineReset = false;
+                    }, 0);
+                }
+            }
+        }
+        return new Promise((resolve, reject) => {
+            const waiting = scheduledJobs.get(container);
+            if (waiting) waiting.resolve();
+            scheduledJobs.set(container, { job, resolve, reject });
+            requestSlice();
+        });
+    }
+
+    function requestSlice() {
+        if (sliceRequested) return;
+        sliceRequested = true;
+        if (window.requestIdleCallback) {
+            requestIdleCallback(runSlice, { timeout: 100 });
+        } else {
+            requestAnimationFrame(() => runSlice(null));
+        }
+    }
+
+    function nearViewport(container) {
+        const rect = container.getBoundingClientRect();
+        const height = window.innerHeight || document.documentElement.clientHeight;
+        return rect.bottom >= -height && rect.top <= 2 * height;
+    }
+
+    function runSlice(deadline) {
+        sliceRequested = false;
+        const started = performance.now();
+        const near = [];
+        const far = [];
+        for (const container of scheduledJobs.keys()) (nearViewport(container) ? near : far).push(container);
+        for (const container of near.concat(far)) {
+            const entry = scheduledJobs.get(container);
+            scheduledJobs.delete(container);
+            try {
+                entry.resolve(entry.job());
+            } catch (error) {
+                entry.reject(error);
+            }
+            const elapsed = performance.now() - started;
+            if (elapsed >= SLICE_BUDGET) break;
+            if (deadline && !deadline.didTimeout && deadline.timeRemaining() <= 0) break;
+        }
+        if (scheduledJobs.size) requestSlice();
+    }
+
+    // ---- Syntax highlighting -----------------------------------------------
+    //
+    // Fenced code with a language (```python) is highlighted with highlight.js
+    // once shown. The core and each grammar are imported on first use, so a
+    // page only loads the grammars its documents contain. Highlighted HTML is
+    // cached by language and code digest, so blocks re-created by an update
+    // with unchanged code skip highlighting; the work itself runs through the
+    // scheduler, so large blocks wait for idle slices.
+
+    const LANGUAGE_ALIASES = {
+        js: 'javascript', jsx: 'javascript', mjs: 'javascript', ts: 'typescript', tsx: 'typescript',
+        py: 'python', sh: 'bash', shell: 'bash', zsh: 'bash', console: 'bash', yml: 'yaml',
+        html: 'xml', svg: 'xml', md: 'markdown', 'c++': 'cpp', cc: 'cpp', h: 'c', rs: 'rust',
+        golang: 'go', kt: 'kotlin', rb: 'ruby', cs: 'csharp', 'c#': 'csharp', ps1: 'powershell',
+    };
+    const HIGHLIGHT_CACHE_BYTES = 4 * 1024 * 1024;
+    // `${language}|${digest(code)}` -> highlighted HTML, least recently used first
+    const highlightCache = new Map();
+    let highlightCacheBytes = 0;
+    let highlighterPromise = null;
+    // Language -> Promise of highlight.js with its grammar, or null if there is none
+    const grammarPromises = new Map();
+    // Code elements waiting for their grammar or slice
+    const highlighting = new WeakSet();
+
+    function loadHighlighter() {
+        if (!highlighterPromise) {
+            highlighterPromise = import(`${config.highlightUrl}/core.min.js`).then((module) => module.default);
+            highlighterPromise.catch(() => {
+                highlighterPromise = null;
+            });
+        }
+        return highlighterPromise;
+    }
+
+    function loadLanguage(language) {
+        let promise = grammarPromises.get(language);
+        if (!promise) {
+            promise = Promise.all([loadHighlighter(), import(`${config.highlightUrl}/languages/${language}.min.js`)])
+                .then(([hljs, module]) => {
+                    hljs.registerLanguage(language, module.default);
+                    return hljs;
+                })
+                // Unknown language (or offline): its blocks stay plain
+                .catch(() => null);
+            grammarPromises.set(language, promise);
+        }
+        return promise;
+    }
+
+    // Grammar name for a code element, or null; names end up in a URL, so
+    // only plain ones are accepted
+    function codeLanguage(code) {
+        const match = /(?:^|\s)language-(\S+)/.exec(code.className);
+        if (!match) return null;
+        const name = match[1].toLowerCase();
+        const language = LANGUAGE_ALIASES[name] || name;
+        return /^[a-z0-9-]+$/.test(language) ? language : null;
+    }
+
+    function rememberHighlight(key, html) {
+        if (html.length > HIGHLIGHT_CACHE_BYTES) return;
+        const old = highlightCache.get(key);
+        if (old !== undefined) {
+            highlightCache.delete(key);
+            highlightCacheBytes -= old.length;
+        }
+        highlightCache.set(key, html);
+        highlightCacheBytes += html.length;
+        for (const [oldest, value] of highlightCache) {
+            if (highlightCacheBytes <= HIGHLIGHT_CACHE_BYTES) break;
+            highlightCache.delete(oldest);
+            highlightCacheBytes -= value.length;
+        }
+    }
+
+    function applyHighlight(code, html) {
+        code.innerHTML = html;
+        code.classList.add('hljs');
+    }
+
+    // Highlight the code blocks in ``container`` that are not highlighted yet
+    function highlightCode(container) {
+        if (!config.highlightUrl) return;
+        for (const code of container.querySelectorAll('pre > code[class*="language-"]')) {
+            if (code.classList.contains('hljs') || highlighting.has(code)) continue;
+            const language = codeLanguage(code);
+            // Diagram sources are drawn, not highlighted
+            if (!language || language === 'mermaid') continue;
+            const text = code.textContent;
+            const key = `${language}|${digest(text)}`;
+            const cached = highlightCache.get(key);
+            if (cached !== undefined) {
+                highlightCache.delete(key);
+                highlightCache.set(key, cached);
+                applyHighlight(code, cached);
+                continue;
+            }
+            highlighting.add(code);
+            loadLanguage(language)
+                .then((hljs) => {
+                    if (!hljs) return;
+                    return schedule(code, () => {
+                        // Replaced or edited while waiting
+                        if (!code.isConnected || code.textContent !== text) return;
+                        const html = hljs.highlight(text, { language, ignoreIllegals: true }).value;
+                        rememberHighlight(key, html);
+                        applyHighlight(code, html);
+                    });
+                })
+                .catch((error) => console.error('Syntax highlighting error:', error))
+                .finally(() => highlighting.delete(code));
+        }
+    }
+
+    // ---- Diagrams ------------------------------------------------------------
+    //
+    // ```mermaid blocks are drawn with Mermaid once they come within the lazy
+    // margin of the viewport. Mermaid is imported on the first diagram, lays
+    // out one diagram at a time in scheduler slices (it measures text in the
+    // DOM, so it cannot run in the worker), and the SVG goes into the render
+    // cache under a digest of the diagram source. A block re-created by an
+    // update, a virtualized re-mount or a revisit gets its SVG from the cache
+    // instead of being laid out again.
+
+    let mermaidPromise = null;
+    let diagramCount = 0;
+    // Layouts run one after another; Mermaid keeps global state while rendering
+    let diagramQueue = Promise.resolve();
+    let diagramObserver = null;
+    // <pre> elements waiting for Mermaid, their slice or the viewport
+    const diagramsPending = new WeakSet();
+    // Keys of sources Mermaid rejected, so they are not retried on every update
+    const failedDiagrams = new Set();
+    const MAX_FAILED_DIAGRAMS = 256;
+
+    function loadMermaid() {
+        if (!mermaidPromise) {
+            mermaidPromise = import(config.mermaidUrl).then((module) => {
+                const mermaid = module.default;
+                mermaid.initialize({ startOnLoad: false, securityLevel: 'strict' });
+                return mermaid;
+            });
+            mermaidPromise.catch(() => {
+                mermaidPromise = null;
+            });
+        }
+        return mermaidPromise;
+    }
+
+    function diagramKey(source) {
+        return `mermaid|${config.mermaidUrl}|${digest(source)}`;
+    }
+
+    function applyDiagram(pre, svg) {
+        pre.innerHTML = svg;
+        pre.classList.add('rx-mermaid');
+    }
+
+    function layoutDiagram(mermaid, source) {
+        const id = `rx-mermaid-${++diagramCount}`;
+        const result = diagramQueue.then(() => mermaid.render(id, source));
+        diagramQueue = result.catch(() => {});
+        return result.then(({ svg }) => svg);
+    }
+
+    async function drawDiagram(pre, code, source, key) {
+        let svg = config.cacheBytes ? await cacheGet(key) : undefined;
+        if (svg === undefined) {
+            const mermaid = await loadMermaid();
+            svg = await schedule(pre, () => {
+                // Replaced or edited while waiting
+                if (!code.isConnected || code.textContent !== source) return undefined;
+                return layoutDiagram(mermaid, source).catch((error) => {
+                    if (failedDiagrams.size >= MAX_FAILED_DIAGRAMS) failedDiagrams.clear();
+                    failedDiagrams.add(key);
+                    throw error;
+                });
+            });
+            if (svg === undefined) return;
+            rememberHtml(key, svg);
+            cachePut(key, svg);
+        }
+        if (code.isConnected && code.textContent === source) applyDiagram(pre, svg);
+    }
+
+    function drawLater(pre) {
+        const { code, source, key } = pre.rxDiagram;
+        drawDiagram(pre, code, source, key)
+            .catch((error) => console.error('Diagram rendering error:', error))
+            .finally(() => diagramsPending.delete(pre));
+    }
+
+    function getDiagramObserver() {
+        if (!diagramObserver) {
+            diagramObserver = new IntersectionObserver((entries) => {
+                for (const entry of entries) {
+                    if (!entry.isIntersecting) continue;
+                    diagramObserver.unobserve(entry.target);
+                    drawLater(entry.target);
+                }
+            }, { rootMargin: config.lazyMargin });
+        }
+        return diagramObserver;
+    }
+
+    // Draw the ```mermaid blocks in ``container`` that are still code
+    function renderDiagrams(container) {
+        if (!config.mermaidUrl) return;
+        for (const code of container.querySelectorAll('pre > code.language-mermaid')) {
+            const pre = code.parentNode;
+            if (diagramsPending.has(pre)) continue;
+            const source = code.textContent;
+            const key = diagramKey(source);
+            if (failedDiagrams.has(key)) continue;
+            const cached = cacheGetSync(key);
+            if (cached !== undefined) {
+                applyDiagram(pre, cached);
+                continue;
+            }
+            diagramsPending.add(pre);
+            pre.rxDiagram = { code, source, key };
+            if (window.IntersectionObserver) {
+                getDiagramObserver().observe(pre);
+            } else {
+                drawLater(pre);
+            }
+        }
+    }
+
+    // ---- Math ----------------------------------------------------------------
+    //
+    // The math extension (extensions.js) leaves formulas as placeholders with
+    // their TeX; they are typeset with KaTeX once shown. KaTeX and its
+    // stylesheet load only when a document contains a formula, each formula's
+    // output is cached by its TeX, and display equations off screen wait until
+    // they come within the lazy margin of the viewport.
+
+    const MATH_CACHE_BYTES = 2 * 1024 * 1024;
+    // `${display}|${tex}` -> KaTeX HTML, least recently used first
+    const mathCache = new Map();
+    let mathCacheBytes = 0;
+    let katexPromise = null;
+    let mathObserver = null;
+    // Placeholders waiting for KaTeX, their slice or the viewport
+    const mathPending = new WeakSet();
+
+    function loadKatex() {
+        if (!katexPromise) {
+            const link = document.createElement('link');
+            link.rel = 'stylesheet';
+            link.href = `${config.katexUrl}/katex.min.css`;
+            document.head.appendChild(link);
+            katexPromise = import(`${config.katexUrl}/katex.mjs`).then((module) => module.default);
+            katexPromise.catch(() => {
+                katexPromise = null;
+            });
+        }
+        return katexPromise;
+    }
+
+    function rememberMath(key, html) {
+        const old = mathCache.get(key);
+        if (old !== undefined) {
+            mathCache.delete(key);
+            mathCacheBytes -= old.length;
+        }
+        mathCache.set(key, html);
+        mathCacheBytes += html.length;
+        for (const [oldest, value] of mathCache) {
+            if (mathCacheBytes <= MATH_CACHE_BYTES) break;
+            mathCache.delete(oldest);
+            mathCacheBytes -= value.length;
+        }
+    }
+
+    function applyMath(element, html) {
+        element.innerHTML = html;
+        element.classList.add('rx-math-done');
+    }
+
+    function typesetLater(element, tex, display, key) {
+        loadKatex()
+            .then((katex) => schedule(element, () => {
+                if (!element.isConnected || element.classList.contains('rx-math-done')) return;
+                const html = katex.renderToString(tex, { displayMode: display, throwOnError: false });
+                rememberMath(key, html);
+                applyMath(element, html);
+            }))
+            .catch((error) => console.error('Math rendering error:', error))
+            .finally(() => mathPending.delete(element));
+    }
+
+    function getMathObserver() {
+        if (!mathObserver) {
+            mathObserver = new IntersectionObserver((entries) => {
+                for (const entry of entries) {
+                    if (!entry.isIntersecting) continue;
+                    mathObserver.unobserve(entry.target);
+                    const { tex, key } = entry.target.rxMath;
+                    typesetLater(entry.target, tex, true, key);
+                }
+            }, { rootMargin: config.lazyMargin });
+        }
+        return mathObserver;
+    }
+
+    // Typeset the formulas in ``container`` that are not typeset yet
+    function renderMath(container) {
+        if (!config.katexUrl) return;
+        for (const element of container.querySelectorAll('.rx-math:not(.rx-math-done)')) {
+            if (mathPending.has(element)) continue;
+            const tex = element.textContent;
+            const display = element.classList.contains('rx-math-display');
+            const key = `${display ? 1 : 0}|${tex}`;
+            const cached = mathCache.get(key);
+            if (cached !== undefined) {
+                mathCache.delete(key);
+                mathCache.set(key, cached);
+                applyMath(element, cached);
+                continue;
+            }
+            mathPending.add(element);
+            if (display && window.IntersectionObserver) {
+                element.rxMath = { tex, key };
+                getMathObserver().observe(element);
+            } else {
+                typesetLater(element, tex, display, key);
+            }
+        }
+    }
+
+    // Everything done to a shown document's HTML once it is in the DOM; also
+    // called on containers whose HTML was rendered by the server
+    function enhance(container) {
+        renderDiagrams(container);
+        highlightCode(container);
+        renderMath(container);
+    }
+
+    // ---- Lazy rendering ----------------------------------------------------
+    //
+    // Instances rendered with ``lazy`` are not parsed until they come within
+    // the root margin of the viewport. One IntersectionObserver per margin
+    // serves the whole page; until then only the latest content is kept.
+
+    // Container -> { content, options, promise, resolve } waiting to be seen
+    const lazyJobs = new WeakMap();
+    // Containers that have been seen and now render straight away
+    const revealed = new WeakSet();
+    // Root margin -> shared observer
+    const lazyObservers = new Map();
+
+    function lazyObserver(margin) {
+        let observer = lazyObservers.get(margin);
+        if (!observer) {
+            observer = new IntersectionObserver((entries) => {
+                for (const entry of entries) {
+                    if (!entry.isIntersecting) continue;
+                    observer.unobserve(entry.target);
+                    revealLazy(entry.target);
+                }
+            }, { rootMargin: margin });
+            lazyObservers.set(margin, observer);
+        }
+        return observer;
+    }
+
+    // Park a render until the container is near the viewport; resolves once
+    // it has actually rendered
+    function deferRender(container, content, options) {
+        let job = lazyJobs.get(container);
+        if (!job) {
+            job = {};
+            job.promise = new Promise((resolve) => {
+                job.resolve = resolve;
+            });
+            lazyJobs.set(container, job);
+            const margin = typeof options.lazy === 'string' ? options.lazy : config.lazyMargin;
+            lazyObserver(margin).observe(container);
+        }
+        job.content = content;
+        job.options = options;
+        return job.promise;
+    }
+
+    function revealLazy(container) {
+        const job = lazyJobs.get(container);
+        if (!job) return;
+        lazyJobs.delete(container);
+        revealed.add(container);
+        job.resolve(render(container, job.content, job.options));
+    }
+
+    // Latest render call per container, so slower earlier calls give way
+    const renderTokens = new WeakMap();
+
+    // Render ``content`` into ``container``. Options: ``worker`` parses it in
+    // the shared worker instead of on the main thread, ``virtual`` keeps only
+    // the blocks near the viewport in the DOM, ``lazy`` (true or a root margin
+    // such as "600px") waits until the container approaches the viewport.
+    async function render(container, content, options) {
+        if (!container) return;
+        if (options && options.lazy && !revealed.has(container) && window.IntersectionObserver) {
+            return deferRender(container, content, options);
+        }
+        const token = {};
+        renderTokens.set(container, token);
+
+        if (!content || !content.trim()) {
+            cancelWorkerJob(container);
+            stopVirtual(container);
+            blockStates.delete(container);
+            cachedSources.delete(container);
+            container.innerHTML = '<p class="empty">暂无内容</p>';
+            return;
+        }
+
+        if (options && options.virtual) {
+            cachedSources.delete(container);
+            cancelWorkerJob(container);
+            try {
+                renderVirtual(await loadMarked(), container, normalize(content));
+            } catch (error) {
+                stopVirtual(container);
+                showError(container, error);
+            }
+            return;
+        }
+        stopVirtual(container);
+
+        // Documents rendered from scratch go through the render cache
+        const src = normalize(content);
+        if (cachedSources.get(container) === src) return;
+        cachedSources.delete(container);
+        let cacheKey = null;
+        if (config.cacheBytes && !blockStates.has(container) && !plainRenders.has(container)) {
+            cacheKey = `${RENDER_VERSION}|${digest(src)}`;
+            const painted = await paintFromCache(container, src, cacheKey, token);
+            if (painted) enhance(container);
+            if (painted !== false) return;
+        }
+
+        if (options && options.worker && getWorker()) {
+            return renderInWorker(container, src, cacheKey);
+        }
+        cancelWorkerJob(container);
+
+        if (!window.marked) {
+            container.innerHTML = '<div class="loading">正在加载 Markdown...</div>';
+        }
+
+        try {
+            const marked = await loadMarked();
+            if (renderTokens.get(container) !== token) return;
+            // Updates of a rendered container only patch a few blocks; first
+            // renders wait for their slice
+            const html = blockStates.has(container)
+                ? renderBlocks(marked, container, src)
+                : await schedule(container, () => (renderTokens.get(container) === token ? renderBlocks(marked, container, src) : null));
+            if (cacheKey && html) cachePut(cacheKey, html.join(''));
+            enhance(container);
+        } catch (error) {
+            blockStates.delete(container);
+            showError(container, error);
+        }
+    }
+
+    // ---- Editor sync -------------------------------------------------------
+    //
+    // An editor reports its changes as ops [offset, deleteCount, insert],
+    // each relative to the text left by the previous one. Keystrokes are
+    // merged into as few ops as possible and sent at most once per interval,
+    // so what goes over the wire scales with the edit, not the document.
+
+    // Offsets and lengths count UTF-16 code units, like JavaScript strings
+    // (and apply_text_ops on the backend).
+
+    const isHighSurrogate = (code) => code >= 0xd800 && code <= 0xdbff;
+    const isLowSurrogate = (code) => code >= 0xdc00 && code <= 0xdfff;
+
+    // The single op turning ``prev`` into ``next``, or null if they are equal.
+    // The op never splits a surrogate pair, so its insert is well-formed text.
+    function diffText(prev, next) {
+        if (prev === next) return null;
+        const min = Math.min(prev.length, next.length);
+        let prefix = 0;
+        while (prefix < min && prev.charCodeAt(prefix) === next.charCodeAt(prefix)) prefix++;
+        if (prefix > 0 && isHighSurrogate(prev.charCodeAt(prefix - 1))) prefix--;
+        let suffix = 0;
+        while (suffix < min - prefix
+            && prev.charCodeAt(prev.length - 1 - suffix) === next.charCodeAt(next.length - 1 - suffix)) suffix++;
+        if (suffix > 0 && isLowSurrogate(prev.charCodeAt(prev.length - suffix))) suffix--;
+        return [prefix, prev.length - prefix - suffix, next.slice(prefix, next.length - suffix)];
+    }
+
+    // Append ``op`` to ``ops``, folding it into the last op when they touch
+    function mergeOp(ops, op) {
+        const last = ops[ops.length - 1];
+        if (last) {
+            const [offset, removed, inserted] = last;
+            const [at, count, text] = op;
+            const end = offset + inserted.length;
+            if (at === end) {
+                // Typing on, or deleting forward, right after the last edit
+                ops[ops.length - 1] = [offset, removed + count, inserted + text];
+                return;
+            }
+            if (at + count === offset) {
+                // Deleting backward into the text before the last edit
+                ops[ops.length - 1] = [at, count + removed, text + inserted];
+                return;
+            }
+            if (at >= offset && at + count <= end) {
+                // Editing the text the last op inserted
+                const start = at - offset;
+                ops[ops.length - 1] = [offset, removed, inserted.slice(0, start) + text + inserted.slice(start + count)];
+                return;
+            }
+        }
+        ops.push(op);
+    }
+
+    // Editors bound by bindEditor, by text area
+    const editors = new WeakMap();
+
+    let crcTable = null;
+
+    // CRC-32 of ``text`` as UTF-16LE, which the backend can compute at C
+    // speed (zlib.crc32 in apply_text_ops)
+    function textChecksum(text) {
+        if (!crcTable) {
+            crcTable = new Int32Array(256);
+            for (let byte = 0; byte < 256; byte++) {
+                let crc = byte;
+                for (let bit = 0; bit < 8; bit++) crc = crc & 1 ? 0xedb88320 ^ (crc >>> 1) : crc >>> 1;
+                crcTable[byte] = crc;
+            }
+        }
+        let crc = -1;
+        for (let index = 0; index < text.length; index++) {
+            const code = text.charCodeAt(index);
+            crc = crcTable[(crc ^ code) & 0xff] ^ (crc >>> 8);
+            crc = crcTable[(crc ^ (code >>> 8)) & 0xff] ^ (crc >>> 8);
+        }
+        return (crc ^ -1) >>> 0;
+    }
+
+    // Track the edits made in ``textarea``: ``options.send(ops, length,
+    // checksum)`` gets them at most every ``options.debounce`` ms (and on
+    // blur), along with the resulting text's length and ``textChecksum`` so
+    // the backend can tell when its copy has diverged; ``options.preview`` is
+    // the id of a container kept rendered from the editor's text, with the
+    // ``worker`` and ``virtual`` render options given in ``options``.
+    function bindEditor(textarea, options) {
+        let last = textarea.value;
+        let ops = [];
+        let timer = null;
+
+        function preview() {
+            const container = options.preview && document.getElementById(options.preview);
+            if (container) render(container, textarea.value, { worker: options.worker, virtual: options.virtual });
+        }
+
+        function flush() {
+            clearTimeout(timer);
+            timer = null;
+            if (!ops.length) return;
+            const sent = ops;
+            ops = [];
+            options.send(sent, last.length, textChecksum(last));
+        }
+
+        function onInput() {
+            const next = textarea.value;
+            const op = diffText(last, next);
+            last = next;
+            if (!op) return;
+            mergeOp(ops, op);
+            preview();
+            if (timer === null) timer = setTimeout(flush, options.debounce || 0);
+        }
+
+        textarea.addEventListener('input', onInput);
+        textarea.addEventListener('blur', flush);
+        const editor = {
+            // Replace the text (e.g. with the backend's copy) without sending it back
+            reset(text) {
+                clearTimeout(timer);
+                timer = null;
+                ops = [];
+                textarea.value = text || '';
+                last = textarea.value;
+                preview();
+            },
+            // The full text, as the new base for later ops; the ops not sent
+            // yet are part of it and dropped
+            resync() {
+                clearTimeout(timer);
+                timer = null;
+                ops = [];
+                last = textarea.value;
+                return last;
+            },
+            stop() {
+                flush();
+                textarea.removeEventListener('input', onInput);
+                textarea.removeEventListener('blur', flush);
+                editors.delete(textarea);
+            },
+        };
+        editors.set(textarea, editor);
+        return editor;
+    }
+
+    // The full text of the editor with element ``id``, for a backend whose
+    // copy has diverged (see resync_editor); null if there is no such element
+    function resyncEditor(id) {
+        const textarea = document.getElementById(id);
+        if (!textarea) return null;
+        const editor = editors.get(textarea);
+        return editor ? editor.resync() : textarea.value;
+    }
+
+    const api = {
+        config,
+        loadMarked,
+        render,
+        append,
+        reset,
+        bindEditor,
+        resyncEditor,
+        enhance,
+    };
+    window.ReflexMarkdown = api;
+
+    // Run the jobs of instances that mounted before the runtime loaded
+    const queued = window.ReflexMarkdownQueue || [];
+    window.ReflexMarkdownQueue = { push: (job) => job(api) };
+    queued.forEach((job) => job(api));
+})();
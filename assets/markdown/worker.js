@@ -0,0 +1,111 @@
+/*
+ * Markdown parsing off the main thread, for runtime.js worker mode.
+ *
+ * Started once per page as a module worker. Each "render" message carries a
+ * container key, a sequence number and the document; the reply holds the
+ * source and HTML of every top-level block so the page can patch only the
+ * blocks that changed. Jobs superseded by a newer one for the same key
+ * before they start are skipped.
+ */
+
+let markedUrl = null;
+let extensionsUrl = null;
+// Tags the sanitizer allows beyond its standard set; null turns it off
+let customTags = null;
+let clean = (html) => html;
+let markedPromise = null;
+
+// Container key -> latest job not started yet
+const pending = new Map();
+let scheduled = false;
+
+// Container key -> { links, html: Map(block source -> HTML) } of its last
+// result, so unchanged blocks are not parsed again. Bounded, oldest first out.
+const previous = new Map();
+const MAX_PREVIOUS = 32;
+
+function loadMarked() {
+    if (!markedPromise) {
+        markedPromise = Promise.all([
+            import(markedUrl),
+            extensionsUrl ? import(extensionsUrl) : null,
+        ]).then(([module, extensions]) => {
+            const marked = module.marked;
+            marked.setOptions({
+                breaks: true,
+                gfm: true,
+            });
+            if (extensions) {
+                extensions.default(marked);
+                if (customTags) clean = extensions.createSanitizer(customTags);
+            }
+            return marked;
+        });
+        markedPromise.catch(() => {
+            markedPromise = null;
+        });
+    }
+    return markedPromise;
+}
+
+function parse(marked, key, src) {
+    const tokens = new marked.Lexer().lex(src);
+    let length = 0;
+    for (const token of tokens) length += token.raw.length;
+    if (length !== src.length) {
+        // Not splittable into blocks (see lex() in runtime.js)
+        previous.delete(key);
+        return { raws: null, html: [clean(marked.parse(src))], links: {} };
+    }
+
+    const links = JSON.stringify(tokens.links);
+    const last = previous.get(key);
+    const cached = last && last.links === links ? last.html : new Map();
+    const raws = tokens.map((token) => token.raw);
+    const html = tokens.map((token) => {
+        const known = cached.get(token.raw);
+        return known !== undefined ? known : clean(marked.parser([token]));
+    });
+
+    previous.delete(key);
+    previous.set(key, { links, html: new Map(raws.map((raw, index) => [raw, html[index]])) });
+    if (previous.size > MAX_PREVIOUS) previous.delete(previous.keys().next().value);
+    return { raws, html, links: { ...tokens.links } };
+}
+
+async function drain() {
+    scheduled = false;
+    let marked;
+    try {
+        marked = await loadMarked();
+    } catch (error) {
+        for (const [key, job] of pending) {
+            self.postMessage({ key, seq: job.seq, error: `无法加载 marked.js: ${error.message || error}` });
+        }
+        pending.clear();
+        return;
+    }
+    for (const [key, job] of pending) {
+        pending.delete(key);
+        try {
+            self.postMessage({ key, seq: job.seq, ...parse(marked, key, job.content) });
+        } catch (error) {
+            self.postMessage({ key, seq: job.seq, error: error.message || String(error) });
+        }
+    }
+}
+
+self.onmessage = (event) => {
+    const message = event.data;
+    if (message.type === 'init') {
+        markedUrl = message.markedUrl;
+        extensionsUrl = message.extensionsUrl || null;
+        customTags = message.customTags || null;
+        return;
+    }
+    pending.set(message.key, message);
+    if (!scheduled) {
+        scheduled = true;
+        setTimeout(drain, 0);
+    }
+};
@@ -0,0 +1,139 @@
+"""
+Size and client cost of the three ways to ship a document to the browser.
+
+For every corpus kind and size, compares sending raw Markdown (parsed by
+marked.js), server-rendered HTML and the compact AST (components.markdown_ast):
+
+- payload bytes as they travel over the state channel (JSON-encoded)
+- backend time: cold HTML render, cold AST encode (render included) and a
+  cached AST
+- browser CPU from the received JSON to a laid-out DOM: marked.parse plus
+  innerHTML, innerHTML of the HTML, and building the DOM from the AST
+  (headless Chromium; the React renderer adds element creation on top)
+
+    python benchmarks/ast_transport.py --sizes 10 100 1024
+    python benchmarks/ast_transport.py --no-browser
+"""
+
+import argparse
+import json
+import sys
+
+from corpus import SECTIONS, document
+from harness import ROOT, browser_page, harness_html, serve
+from suite import median_ms
+
+sys.path.insert(0, str(ROOT))
+
+from components.engine import render_cache, render_html  # noqa: E402
+from components.markdown_ast import ast_cache, render_ast  # noqa: E402
+
+CLIENT_SCRIPT = """
+async ([markdown, html, ast, repeat]) => {
+    const target = document.getElementById('target');
+    await window.ReflexMarkdown.loadMarked();
+
+    function build(node, tags, parent) {
+        if (typeof node === 'string') {
+            parent.appendChild(document.createTextNode(node));
+            return;
+        }
+        const entry = tags[node[0]];
+        const element = document.createElement(typeof entry === 'string' ? entry : entry[0]);
+        if (typeof entry !== 'string') {
+            for (const [name, value] of Object.entries(entry[1])) {
+                if (name === 'className') element.className = value;
+                else if (name === 'style') Object.assign(element.style, value);
+                else element.setAttribute(name === 'defaultChecked' ? 'checked' : name, value === true ? '' : value);
+            }
+        }
+        for (let index = 1; index < node.length; index++) build(node[index], tags, element);
+        parent.appendChild(element);
+    }
+
+    const ways = {
+        markdown: () => { target.innerHTML = window.marked.parse(JSON.parse(markdown)); },
+        html: () => { target.innerHTML = JSON.parse(html); },
+        ast: () => {
+            const tree = JSON.parse(ast);
+            const fragment = document.createDocumentFragment();
+            for (let index = 2; index < tree.length; index++) build(tree[index], tree[1], fragment);
+            target.replaceChildren(fragment);
+        },
+    };
+    const result = {};
+    for (const [name, run] of Object.entries(ways)) {
+        const samples = [];
+        for (let index = 0; index < repeat; index++) {
+            target.replaceChildren();
+            const started = performance.now();
+            run();
+            target.getBoundingClientRect();
+            samples.push(performance.now() - started);
+        }
+        samples.sort((a, b) => a - b);
+        result[name] = samples[samples.length >> 1];
+    }
+    return result;
+}
+"""
+
+
+def measure(doc: str, repeat: int) -> tuple[dict, dict]:
+    render_cache.clear()
+    html = render_html(doc)
+    ast_cache.clear()
+    tree = render_ast(doc)
+    payloads = {
+        "markdown": json.dumps(doc, ensure_ascii=False),
+        "html": json.dumps(html, ensure_ascii=False),
+        "ast": json.dumps(tree, ensure_ascii=False, separators=(",", ":")),
+    }
+
+    def cold_ast():
+        render_cache.clear()
+        ast_cache.clear()
+        render_ast(doc)
+
+    result = {
+        "markdown_bytes": len(payloads["markdown"].encode("utf-8")),
+        "html_bytes": len(payloads["html"].encode("utf-8")),
+        "ast_bytes": len(payloads["ast"].encode("utf-8")),
+        "html_render_ms": median_ms(lambda: (render_cache.clear(), render_html(doc)), repeat),
+        "ast_encode_ms": median_ms(cold_ast, repeat),
+        "ast_cached_ms": median_ms(lambda: render_ast(doc), repeat),
+    }
+    return result, payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kinds", nargs="+", choices=list(SECTIONS), default=list(SECTIONS))
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10, 100, 1024], help="document sizes in KB")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-browser", dest="browser", action="store_false", help="skip the headless browser metrics")
+    args = parser.parse_args()
+
+    runs = []
+    for kind in args.kinds:
+        for size in args.sizes:
+            result, payloads = measure(document(kind, int(size * 1024)), args.repeat)
+            runs.append(({"kind": kind, "document_kb": size, **result}, payloads))
+            print(f"{kind} {size} KB: python done", file=sys.stderr)
+
+    if args.browser:
+        pages = {"/ast.html": harness_html('<div class="rx-markdown" id="target"></div>', cache_bytes=0)}
+        with serve(pages) as base_url, browser_page() as page:
+            page.goto(base_url + "/ast.html")
+            for result, payloads in runs:
+                client = page.evaluate(
+                    CLIENT_SCRIPT,
+                    [payloads["markdown"], payloads["html"], payloads["ast"], args.repeat],
+                )
+                result.update({f"client_{name}_ms": round(value, 3) for name, value in client.items()})
+
+    print(json.dumps([result for result, _ in runs], indent=2))
+
+
+if __name__ == "__main__":
+    main()
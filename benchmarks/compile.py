@@ -0,0 +1,68 @@
+"""
+Page build and compile time with many Markdown instances.
+
+Builds a page with ``--instances`` client-mode instances of each component
+(half plain strings, half bound to a state Var, as in an ``rx.foreach``
+over messages) and compiles it the way ``reflex compile`` does, reporting
+the median of ``--repeat`` runs. Needs no browser:
+
+    python benchmarks/compile.py --instances 500
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from harness import ROOT
+
+sys.path.insert(0, str(ROOT))
+
+import reflex as rx  # noqa: E402
+from reflex.compiler.compiler import _compile_page  # noqa: E402
+
+from suite import COMPONENTS  # noqa: E402
+
+
+class CompileState(rx.State):
+    message: str = ""
+
+
+def page(factory, instances: int) -> rx.Component:
+    return rx.vstack(*[
+        factory(f"## Message {index}\n\nSome **text** for message {index}.", mode="client")
+        if index % 2 else factory(CompileState.message, mode="client")
+        for index in range(instances)
+    ])
+
+
+def measure(factory, instances: int, repeat: int) -> dict:
+    build, compile_ = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        component = page(factory, instances)
+        built = time.perf_counter()
+        _compile_page(component, "/")
+        build.append((built - started) * 1000)
+        compile_.append((time.perf_counter() - built) * 1000)
+    return {
+        "build_ms": round(statistics.median(build), 1),
+        "compile_ms": round(statistics.median(compile_), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instances", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {"instances": args.instances}
+    for name, factory in COMPONENTS.items():
+        results[name] = measure(factory, args.instances, args.repeat)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
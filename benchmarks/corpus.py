@@ -0,0 +1,81 @@
+"""
+Synthetic Markdown corpus for the benchmarks.
+
+Each kind repeats a numbered section until the document reaches the
+requested size, so documents are deterministic and comparable across runs.
+"""
+
+PROSE = """## Chapter {index}
+
+Markdown is *easy to write* and **easy to read**. This paragraph has a
+[link](https://example.com/{index}), some `inline code` and ~~struck~~ text,
+and runs long enough to wrap over several lines in the rendered output.
+
+> A quoted remark about chapter {index}, with a second sentence for length.
+
+"""
+
+TABLES = """### Table {index}
+
+| id | name | status | score | note |
+|---:|------|:------:|------:|------|
+| {index}1 | alpha | ok | 0.91 | first row |
+| {index}2 | beta | **failed** | 0.42 | `retry` |
+| {index}3 | gamma | ok | 0.77 | [details](https://example.com/{index}) |
+| {index}4 | delta | skipped | 0.00 | - |
+| {index}5 | epsilon | ok | 0.99 | last row |
+
+"""
+
+CODE = """#### Snippet {index}
+
+```python
+def handler_{index}(request):
+    \"\"\"Handle request {index}.\"\"\"
+    data = request.json()
+    if not data:
+        raise ValueError("empty body")
+    return {{"id": {index}, "items": [item * 2 for item in data]}}
+```
+
+```javascript
+export function render{index}(container, items) {{
+    container.replaceChildren(...items.map((item) => item.node));
+}}
+```
+
+"""
+
+NESTED = """- Level one {index}
+  - Level two with *emphasis*
+    - Level three with `code`
+      1. Level four, ordered
+         - Level five
+           - Level six with a [link](https://example.com/{index})
+      2. Back to level four
+    - Level three again
+  - Level two again
+- Closing item {index}
+
+"""
+
+SECTIONS = {
+    "prose": PROSE,
+    "tables": TABLES,
+    "code": CODE,
+    "nested": NESTED,
+}
+
+
+def document(kind: str, size: int) -> str:
+    """Return a ``kind`` document of at least ``size`` characters."""
+    section = SECTIONS[kind]
+    parts = []
+    length = 0
+    index = 0
+    while length < size:
+        part = section.format(index=index)
+        parts.append(part)
+        length += len(part)
+        index += 1
+    return "".join(parts)
@@ -0,0 +1,106 @@
+"""
+Event-loop lag of backend rendering under a mixed workload.
+
+Simulates one Reflex backend worker: a probe task stands in for the other
+websocket clients and measures how late a 5 ms timer fires, while
+``--clients`` handlers render a mix of small messages and a few
+multi-megabyte documents (some of them requested by several clients at
+once). Each mode renders the same workload:
+
+- inline: ``render_html`` called in the handler (blocks the loop)
+- thread / process: ``await render_async`` in the matching pool
+
+    python benchmarks/event_loop.py --clients 20 --large-kb 2048
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from corpus import document
+from harness import ROOT
+
+sys.path.insert(0, str(ROOT))
+
+from components import engine  # noqa: E402
+from components.engine import render_async, render_cache, render_html  # noqa: E402
+
+PROBE_INTERVAL = 0.005
+
+
+def workload(clients: int, small: int, large_kb: int) -> list[list[str]]:
+    """Documents each client renders, in order."""
+    large = [document(kind, large_kb * 1024) for kind in ("prose", "code")]
+    jobs = []
+    for client in range(clients):
+        docs = [f"## Message {client}-{index}\n\n" + document("prose", 1024) for index in range(small)]
+        # Every fifth client also opens one of the shared large documents
+        if client % 5 == 0:
+            docs.insert(small // 2, large[(client // 5) % len(large)])
+        jobs.append(docs)
+    return jobs
+
+
+async def probe(lags: list[float], stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - started - PROBE_INTERVAL) * 1000)
+
+
+async def run(mode: str, jobs: list[list[str]]) -> dict:
+    render_cache.clear()
+    if mode != "inline":
+        engine.configure_executor(mode)
+        # Start the pool's workers outside the measurement
+        await render_async("warm up")
+        render_cache.clear()
+
+    async def client(docs: list[str]):
+        for doc in docs:
+            if mode == "inline":
+                render_html(doc)
+            else:
+                await render_async(doc)
+            # Yield like a handler sending its state update
+            await asyncio.sleep(0)
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(client(docs) for docs in jobs))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+
+    lags.sort()
+    return {
+        "mode": mode,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "lag_p50_ms": round(statistics.median(lags), 2),
+        "lag_p99_ms": round(lags[int(len(lags) * 0.99)], 2),
+        "lag_max_ms": round(lags[-1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--small", type=int, default=10, help="small messages per client")
+    parser.add_argument("--large-kb", type=int, default=2048, help="size of the shared large documents")
+    parser.add_argument("--modes", nargs="+", choices=["inline", "thread", "process"], default=["inline", "thread", "process"])
+    args = parser.parse_args()
+
+    jobs = workload(args.clients, args.small, args.large_kb)
+    # Load lexers and build parsers before the first mode is timed
+    render_html(document("code", 16 * 1024))
+    results = [asyncio.run(run(mode, jobs)) for mode in args.modes]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Helpers shared by the browser benchmarks.
+
+The benchmarks drive ``assets/markdown/runtime.js`` directly in headless
+Chromium (via Playwright) on a small static page, so they measure the client
+runtime without having to build and start a Reflex app:
+
+    pip install playwright && playwright install chromium
+"""
+
+import functools
+import http.server
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = ROOT / "assets"
+
+sys.path.insert(0, str(ROOT))
+
+# Resolves the same marked.js build the components load
+from components import runtime  # noqa: E402
+
+
+def default_marked_url() -> str:
+    """The URL ``markdown_head`` would use: the vendored marked.js, or the CDN build."""
+    return runtime.marked_url()
+
+
+def harness_html(body: str = "", marked_url: str | None = None, cache_bytes: int | None = None) -> str:
+    """
+    Return a page that loads the Markdown assets the way ``markdown_head`` does.
+    ``cache_bytes=0`` turns the persistent render cache off.
+    """
+    marked_url = marked_url or default_marked_url()
+    cache_attr = f' data-cache-bytes="{cache_bytes}"' if cache_bytes is not None else ""
+    return f"""<!doctype html>
+<html>
+<head>
+<meta charset="utf-8">
+<link rel="stylesheet" href="/markdown/markdown.css">
+<link rel="modulepreload" href="{marked_url}" crossorigin="anonymous">
+<script src="/markdown/runtime.js" data-marked-url="{marked_url}"{cache_attr}></script>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    pages: dict[str, str] = {}
+
+    def do_GET(self):
+        page = self.pages.get(self.path.split("?")[0])
+        if page is None:
+            return super().do_GET()
+        data = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve(pages: dict[str, str]):
+    """
+    Serve ``assets/`` plus the given in-memory ``pages`` ({path: html}) on a
+    free local port, yielding the base URL.
+    """
+    handler = type("Handler", (_Handler,), {"pages": pages})
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(handler, directory=str(ASSETS_DIR))
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+
+
+@contextmanager
+def browser_page():
+    """Yield a fresh headless Chromium page."""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        try:
+            yield browser.new_page()
+        finally:
+            browser.close()
+
+
+def cpu_probe(page):
+    """
+    Return a function reading Chromium's cumulative performance counters
+    (TaskDuration, ScriptDuration, ... in seconds) for ``page``.
+    """
+    session = page.context.new_cdp_session(page)
+    session.send("Performance.enable")
+
+    def read() -> dict[str, float]:
+        metrics = session.send("Performance.getMetrics")["metrics"]
+        return {metric["name"]: metric["value"] for metric in metrics}
+
+    return read
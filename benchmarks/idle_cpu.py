@@ -0,0 +1,84 @@
+"""
+Idle CPU of a page showing state-bound Markdown.
+
+Compares the event-driven render (one render per content change, which is
+what ImprovedMarkdown's effect does) with the 100 ms setInterval watcher it
+used to install. Both pages render the same documents, then sit idle while
+Chromium's task counters are sampled:
+
+    python benchmarks/idle_cpu.py --instances 50 --seconds 10
+"""
+
+import argparse
+import json
+import time
+
+from harness import browser_page, cpu_probe, harness_html, serve
+
+DOCUMENT = "# Status\n\n" + "Some **markdown** with `code` and a [link](https://example.com).\n\n" * 20
+
+# The watcher ImprovedMarkdown emitted before it switched to a React effect
+LEGACY_WATCHER = """
+window.lastMarkdownContent = window.currentContent;
+window.markdownWatcher = setInterval(() => {
+    const currentContent = String(window.currentContent);
+    if (window.lastMarkdownContent !== currentContent) {
+        window.lastMarkdownContent = currentContent;
+        document.querySelectorAll('.rx-markdown').forEach((el) => window.ReflexMarkdown.render(el, currentContent));
+    }
+}, 100);
+"""
+
+
+def page_body(instances: int, legacy: bool) -> str:
+    containers = "\n".join(f'<div class="rx-markdown" id="md-{i}"></div>' for i in range(instances))
+    return f"""
+{containers}
+<script>
+window.currentContent = {json.dumps(DOCUMENT)};
+window.rendered = Promise.all(
+    Array.from(document.querySelectorAll('.rx-markdown'), (el) => window.ReflexMarkdown.render(el, window.currentContent))
+);
+{LEGACY_WATCHER if legacy else ""}
+</script>
+"""
+
+
+def measure(base_url: str, path: str, seconds: float) -> dict:
+    with browser_page() as page:
+        page.goto(base_url + path)
+        page.evaluate("window.rendered")
+        read = cpu_probe(page)
+        # Let the initial render settle before sampling the idle window
+        time.sleep(1)
+        before = read()
+        time.sleep(seconds)
+        after = read()
+    return {
+        "task_ms_per_s": round((after["TaskDuration"] - before["TaskDuration"]) * 1000 / seconds, 3),
+        "script_ms_per_s": round((after["ScriptDuration"] - before["ScriptDuration"]) * 1000 / seconds, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instances", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    pages = {
+        "/effect.html": harness_html(page_body(args.instances, legacy=False)),
+        "/interval.html": harness_html(page_body(args.instances, legacy=True)),
+    }
+    with serve(pages) as base_url:
+        results = {
+            "instances": args.instances,
+            "idle_seconds": args.seconds,
+            "effect": measure(base_url, "/effect.html", args.seconds),
+            "interval_100ms": measure(base_url, "/interval.html", args.seconds),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
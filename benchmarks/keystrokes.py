@@ -0,0 +1,91 @@
+"""
+Per-keystroke cost of the live preview.
+
+Types characters into the middle of documents of increasing size and times
+``ReflexMarkdown.render`` (which re-lexes and patches only the edited
+top-level blocks) against a full ``marked.parse`` plus ``innerHTML``
+replacement, the way the preview used to update:
+
+    python benchmarks/keystrokes.py --sizes 10 50 200 --keystrokes 200
+"""
+
+import argparse
+import json
+
+from harness import browser_page, harness_html, serve
+
+SECTION = """## Section {index}
+
+Some **markdown** with `code`, a [link](https://example.com) and enough
+text to make the paragraph wrap over a couple of lines in the preview.
+
+- first item
+- second item with *emphasis*
+
+```python
+def section_{index}():
+    return {index}
+```
+
+"""
+
+TYPE_SCRIPT = """
+async ([size, keystrokes]) => {
+    const section = %s;
+    let doc = '';
+    for (let index = 0; doc.length < size; index++) doc += section.replaceAll('{index}', index);
+    const incremental = document.getElementById('incremental');
+    const full = document.getElementById('full');
+    await window.ReflexMarkdown.render(incremental, doc);
+    full.innerHTML = window.marked.parse(doc);
+
+    // Type into the paragraph of the middle section
+    const at = doc.indexOf('couple of lines', doc.length >> 1);
+    const timings = { incremental: [], full: [] };
+    let text = doc;
+    for (let index = 0; index < keystrokes; index++) {
+        text = text.slice(0, at + index) + 'x' + text.slice(at + index);
+        let started = performance.now();
+        await window.ReflexMarkdown.render(incremental, text);
+        timings.incremental.push(performance.now() - started);
+        started = performance.now();
+        full.innerHTML = window.marked.parse(text);
+        timings.full.push(performance.now() - started);
+    }
+    if (incremental.innerHTML !== full.innerHTML) throw new Error('incremental render diverged');
+    return timings;
+}
+"""
+
+
+def summarize(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    return {
+        "median_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95)], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200], help="document sizes in KB")
+    parser.add_argument("--keystrokes", type=int, default=200)
+    args = parser.parse_args()
+
+    body = '<div class="rx-markdown" id="incremental"></div><div class="rx-markdown" id="full"></div>'
+    results = []
+    with serve({"/keystrokes.html": harness_html(body)}) as base_url, browser_page() as page:
+        page.goto(base_url + "/keystrokes.html")
+        for size in args.sizes:
+            timings = page.evaluate(TYPE_SCRIPT % json.dumps(SECTION), [size * 1024, args.keystrokes])
+            results.append({
+                "document_kb": size,
+                "keystrokes": args.keystrokes,
+                "incremental": summarize(timings["incremental"]),
+                "full": summarize(timings["full"]),
+            })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Main-thread long tasks while typing into a large document.
+
+Renders a large document, then simulates typing (one keystroke every
+``--interval`` ms, each followed by a render, as the editor preview does)
+with parsing on the main thread and in the shared Web Worker. Reports the
+long tasks (> 50 ms) the page saw and how late a 10 ms heartbeat timer ran,
+a proxy for input latency. Also mounts ``--instances`` small documents at
+once, which the runtime's scheduler spreads over idle-time slices:
+
+    python benchmarks/long_tasks.py --kb 1024 --keystrokes 100 --instances 200
+"""
+
+import argparse
+import json
+
+from harness import browser_page, harness_html, serve
+
+SECTION = """## Section {index}
+
+A paragraph with **bold**, *italic*, `code` and a [link](https://example.com/{index}),
+long enough to give the inline lexer some work on every line of it.
+
+| key | value |
+|-----|-------|
+| a   | {index} |
+
+- item one
+- item two
+
+"""
+
+TYPE_SCRIPT = """
+async ([size, keystrokes, interval, worker]) => {
+    const section = %s;
+    let doc = '';
+    for (let index = 0; doc.length < size; index++) doc += section.replaceAll('{index}', index);
+    const container = document.getElementById('preview');
+    const options = { worker };
+    await window.ReflexMarkdown.render(container, doc, options);
+
+    const longTasks = [];
+    const observer = new PerformanceObserver((list) => longTasks.push(...list.getEntries()));
+    observer.observe({ entryTypes: ['longtask'] });
+    let maxLag = 0;
+    let expected = performance.now() + 10;
+    const heartbeat = setInterval(() => {
+        const now = performance.now();
+        maxLag = Math.max(maxLag, now - expected);
+        expected = now + 10;
+    }, 10);
+
+    const at = doc.length >> 1;
+    let text = doc;
+    let last;
+    for (let index = 0; index < keystrokes; index++) {
+        text = text.slice(0, at + index) + 'x' + text.slice(at + index);
+        last = window.ReflexMarkdown.render(container, text, options);
+        await new Promise((resolve) => setTimeout(resolve, interval));
+    }
+    await last;
+    await new Promise((resolve) => setTimeout(resolve, 100));
+    clearInterval(heartbeat);
+    observer.disconnect();
+    return {
+        long_tasks: longTasks.length,
+        long_task_ms: +longTasks.reduce((total, task) => total + task.duration, 0).toFixed(1),
+        max_heartbeat_lag_ms: +maxLag.toFixed(1),
+    };
+}
+"""
+
+MOUNT_SCRIPT = """
+async (instances) => {
+    const section = %s;
+    const containers = [];
+    for (let index = 0; index < instances; index++) {
+        const container = document.createElement('div');
+        container.className = 'rx-markdown';
+        document.body.appendChild(container);
+        containers.push(container);
+    }
+    await window.ReflexMarkdown.loadMarked();
+
+    const longTasks = [];
+    const observer = new PerformanceObserver((list) => longTasks.push(...list.getEntries()));
+    observer.observe({ entryTypes: ['longtask'] });
+    const started = performance.now();
+    await Promise.all(containers.map((container, index) =>
+        window.ReflexMarkdown.render(container, section.repeat(4).replaceAll('{index}', index))
+    ));
+    const elapsed = performance.now() - started;
+    await new Promise((resolve) => setTimeout(resolve, 100));
+    observer.disconnect();
+    return {
+        instances,
+        all_rendered_ms: +elapsed.toFixed(1),
+        long_tasks: longTasks.length,
+        longest_task_ms: +Math.max(0, ...longTasks.map((task) => task.duration)).toFixed(1),
+    };
+}
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kb", type=int, default=1024, help="document size in KB")
+    parser.add_argument("--keystrokes", type=int, default=100)
+    parser.add_argument("--interval", type=int, default=50, help="milliseconds between keystrokes")
+    parser.add_argument("--instances", type=int, default=200, help="instances mounted at once")
+    args = parser.parse_args()
+
+    body = '<div class="rx-markdown" id="preview"></div>'
+    script = TYPE_SCRIPT % json.dumps(SECTION)
+    results = {"document_kb": args.kb, "keystrokes": args.keystrokes}
+    with serve({"/long_tasks.html": harness_html(body)}) as base_url:
+        for name, worker in (("main_thread", False), ("worker", True)):
+            with browser_page() as page:
+                page.goto(base_url + "/long_tasks.html")
+                results[name] = page.evaluate(
+                    script, [args.kb * 1024, args.keystrokes, args.interval, worker]
+                )
+        with browser_page() as page:
+            page.goto(base_url + "/long_tasks.html")
+            results["mount"] = page.evaluate(MOUNT_SCRIPT % json.dumps(SECTION), args.instances)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
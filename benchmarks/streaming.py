@@ -0,0 +1,88 @@
+"""
+Per-token cost of streamed Markdown.
+
+Streams an answer token by token and times ``ReflexMarkdown.append`` (which
+re-parses only the open block) against re-rendering the accumulated answer
+with ``marked.parse`` plus ``innerHTML`` on every token, the way a growing
+state Var is rendered. Costs are reported per slice of the answer, so a flat
+``append`` column means per-token cost does not grow with the answer:
+
+    python benchmarks/streaming.py --kb 40
+"""
+
+import argparse
+import json
+
+from harness import browser_page, harness_html, serve
+
+ANSWER = """## Step {index}
+
+The answer explains **step {index}** in a paragraph long enough to be
+streamed over many tokens, with `inline code` and a [link](https://example.com).
+
+1. first point
+2. second point
+
+```python
+result_{index} = compute({index})
+```
+
+"""
+
+STREAM_SCRIPT = """
+async ([size, slices]) => {
+    const section = %s;
+    let answer = '';
+    for (let index = 0; answer.length < size; index++) answer += section.replaceAll('{index}', index);
+    const tokens = answer.match(/\\S+\\s*|\\s+/g);
+    const stream = document.getElementById('stream');
+    const full = document.getElementById('full');
+    // Flush every token right away instead of once per frame, so each
+    // append is timed on its own (the flush is done once the loader settles)
+    window.requestAnimationFrame = (callback) => callback();
+    await window.ReflexMarkdown.loadMarked();
+
+    const perSlice = Math.ceil(tokens.length / slices);
+    const results = [];
+    let text = '';
+    for (let slice = 0; slice < slices; slice++) {
+        let append = 0;
+        let rerender = 0;
+        const batch = tokens.slice(slice * perSlice, (slice + 1) * perSlice);
+        for (const token of batch) {
+            text += token;
+            let started = performance.now();
+            window.ReflexMarkdown.append(stream, token);
+            await window.ReflexMarkdown.loadMarked();
+            append += performance.now() - started;
+            started = performance.now();
+            full.innerHTML = window.marked.parse(text);
+            rerender += performance.now() - started;
+        }
+        results.push({
+            answer_kb: +(text.length / 1024).toFixed(1),
+            append_ms_per_token: +(append / batch.length).toFixed(3),
+            rerender_ms_per_token: +(rerender / batch.length).toFixed(3),
+        });
+    }
+    if (stream.innerHTML !== full.innerHTML) throw new Error('streamed render diverged');
+    return results;
+}
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kb", type=int, default=40, help="answer size in KB")
+    parser.add_argument("--slices", type=int, default=8)
+    args = parser.parse_args()
+
+    body = '<div class="rx-markdown" id="stream"></div><div class="rx-markdown" id="full"></div>'
+    with serve({"/streaming.html": harness_html(body)}) as base_url, browser_page() as page:
+        page.goto(base_url + "/streaming.html")
+        results = page.evaluate(STREAM_SCRIPT % json.dumps(ANSWER), [args.kb * 1024, args.slices])
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Benchmark suite for the five Markdown components.
+
+Runs every component over a synthetic corpus (prose, tables, code-heavy and
+deeply nested lists, 1 KB to 10 MB) and measures:
+
+- Python: component construction time and compiled payload (the page plus
+  the memoized templates it uses), in client and server mode, plus the
+  backend engine's parse time
+- browser: marked.js parse time, time to first render, per-update cost and
+  the paint time of the server-rendered HTML (headless Chromium)
+
+Results are written as JSON and compared against a stored baseline; the
+exit status is 1 when a metric regressed by more than ``--tolerance``:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --update-baseline
+    python benchmarks/suite.py --sizes 1 10 --no-browser
+"""
+
+import argparse
+import gc
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from corpus import SECTIONS, document
+from harness import ROOT, browser_page, harness_html, serve
+
+sys.path.insert(0, str(ROOT))
+
+import reflex as rx  # noqa: E402
+from reflex.compiler.compiler import _compile_page, compile_memo_components  # noqa: E402
+from reflex.components.memo import MEMOS  # noqa: E402
+
+from components.dynamic_markdown import DynamicMarkdown  # noqa: E402
+from components.engine import render_cache, render_html  # noqa: E402
+from components.improved_markdown import ImprovedMarkdown  # noqa: E402
+from components.markdown import Markdown  # noqa: E402
+from components.simple_markdown import SimpleMarkdown  # noqa: E402
+from components.working_markdown import WorkingMarkdown  # noqa: E402
+
+COMPONENTS = {
+    "Markdown": Markdown,
+    "WorkingMarkdown": WorkingMarkdown,
+    "SimpleMarkdown": SimpleMarkdown,
+    "ImprovedMarkdown": ImprovedMarkdown,
+    "DynamicMarkdown": DynamicMarkdown,
+}
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Differences smaller than this (ms or bytes) are noise, whatever the ratio
+MIN_DELTA = 1.0
+
+RENDER_SCRIPT = """
+async ([doc, html, className, updates]) => {
+    const client = document.getElementById('client');
+    const server = document.getElementById('server');
+    client.className = className;
+    server.className = className;
+    await window.ReflexMarkdown.loadMarked();
+
+    let started = performance.now();
+    window.marked.lexer(doc);
+    const parse = performance.now() - started;
+
+    started = performance.now();
+    await window.ReflexMarkdown.render(client, doc);
+    client.getBoundingClientRect();
+    const firstRender = performance.now() - started;
+
+    // Type into the middle of the document
+    const at = doc.length >> 1;
+    const timings = [];
+    let text = doc;
+    for (let index = 0; index < updates; index++) {
+        text = text.slice(0, at + index) + 'x' + text.slice(at + index);
+        started = performance.now();
+        await window.ReflexMarkdown.render(client, text);
+        client.getBoundingClientRect();
+        timings.push(performance.now() - started);
+    }
+
+    started = performance.now();
+    server.innerHTML = html;
+    server.getBoundingClientRect();
+    const serverPaint = performance.now() - started;
+    return { parse, firstRender, timings, serverPaint };
+}
+"""
+
+
+def median_ms(function, repeat: int) -> float:
+    """Median wall time of ``function()`` over ``repeat`` runs, in ms."""
+    samples = []
+    # As timeit does: a collection triggered by garbage from earlier runs
+    # would be charged to whatever happens to be running
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            samples.append((time.perf_counter() - started) * 1000)
+    finally:
+        gc.enable()
+    return round(statistics.median(samples), 3)
+
+
+def walk(component: rx.Component):
+    """Yield ``component`` and all its descendants."""
+    yield component
+    for child in component.children:
+        yield from walk(child)
+
+
+def container_class(component: rx.Component) -> str:
+    """Class name of the element the component renders Markdown into."""
+    for child in walk(component):
+        if child.id is not None and child.class_name is not None:
+            return str(child.class_name)
+        # Memoized templates take it as a prop
+        class_name = getattr(child, "className", None)
+        if class_name is not None:
+            return class_name._var_value
+    raise ValueError("no Markdown container found")
+
+
+def payload_bytes(component: rx.Component) -> int:
+    """
+    Compiled size of a page holding ``component``, including the bodies of
+    the memoized templates it uses (compiled into their own modules).
+    """
+    page = _compile_page(component, "/")
+    memos = [
+        memo for memo in MEMOS.values()
+        if getattr(memo, "export_name", None) and re.search(rf"\b{memo.export_name}\b", page)
+    ]
+    modules, _ = compile_memo_components(memos)
+    return len(page.encode("utf-8")) + sum(len(code.encode("utf-8")) for _, code in modules)
+
+
+def measure_python(factory, doc: str, repeat: int) -> dict:
+    def build_server():
+        # Measure a cold render, not a cache hit
+        render_cache.clear()
+        return factory(doc, mode="server")
+
+    client = factory(doc, mode="client")
+    server = build_server()
+    return {
+        "construct_client_ms": median_ms(lambda: factory(doc, mode="client"), repeat),
+        "construct_server_ms": median_ms(build_server, repeat),
+        "payload_client_bytes": payload_bytes(client),
+        "payload_server_bytes": payload_bytes(server),
+        "class_name": container_class(client),
+    }
+
+
+def measure_browser(page, base_url: str, doc: str, html: str, class_name: str, updates: int) -> dict:
+    # A fresh page per run, so renders are not cloned from an earlier container
+    page.goto(base_url + "/suite.html")
+    result = page.evaluate(RENDER_SCRIPT, [doc, html, class_name, updates])
+    timings = sorted(result["timings"])
+    return {
+        "parse_ms": round(result["parse"], 3),
+        "first_render_ms": round(result["firstRender"], 3),
+        "update_median_ms": round(timings[len(timings) // 2], 3),
+        "update_p95_ms": round(timings[int(len(timings) * 0.95)], 3),
+        "server_paint_ms": round(result["serverPaint"], 3),
+    }
+
+
+def run(args) -> dict:
+    documents = [
+        (kind, size, document(kind, int(size * 1024)))
+        for kind in args.kinds
+        for size in args.sizes
+    ]
+
+    runs = []
+    for kind, size, doc in documents:
+        render_cache.clear()
+        html = render_html(doc)
+        engine_ms = median_ms(lambda: (render_cache.clear(), render_html(doc)), args.repeat)
+        for name in args.components:
+            python = measure_python(COMPONENTS[name], doc, args.repeat)
+            class_name = python.pop("class_name")
+            result = {
+                "component": name,
+                "kind": kind,
+                "document_kb": size,
+                "document_bytes": len(doc.encode("utf-8")),
+                "python": {"engine_parse_ms": engine_ms, **python},
+            }
+            runs.append((result, doc, html, class_name))
+            print(f"{name} {kind} {size} KB: python done", file=sys.stderr)
+
+    if args.browser:
+        # The persistent render cache would turn repeated documents into cache hits
+        pages = {"/suite.html": harness_html(
+            '<div id="client"></div><div id="server"></div>', cache_bytes=0
+        )}
+        with serve(pages) as base_url, browser_page() as page:
+            for result, doc, html, class_name in runs:
+                result["browser"] = measure_browser(page, base_url, doc, html, class_name, args.updates)
+                print(f"{result['component']} {result['kind']} {result['document_kb']} KB: browser done", file=sys.stderr)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "reflex": rx.constants.Reflex.VERSION,
+            "platform": platform.platform(),
+        },
+        "results": [result for result, *_ in runs],
+    }
+
+
+def flatten(report: dict) -> dict[str, float]:
+    """``{"component/kind/size KB/section.metric": value}`` for every metric."""
+    metrics = {}
+    for result in report["results"]:
+        # :g so that sizes given as --sizes 1 match the baseline's default 1
+        prefix = f"{result['component']}/{result['kind']}/{result['document_kb']:g} KB"
+        for section in ("python", "browser"):
+            for metric, value in result.get(section, {}).items():
+                metrics[f"{prefix}/{section}.{metric}"] = value
+    return metrics
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """Metrics (all lower-is-better) that got worse than the baseline by more than ``tolerance``."""
+    current = flatten(report)
+    regressions = []
+    for key, before in flatten(baseline).items():
+        after = current.get(key)
+        if after is None or after - before <= MIN_DELTA:
+            continue
+        if before == 0 or after / before > 1 + tolerance:
+            regressions.append({"metric": key, "baseline": before, "current": after})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--components", nargs="+", choices=list(COMPONENTS), default=list(COMPONENTS))
+    parser.add_argument("--kinds", nargs="+", choices=list(SECTIONS), default=list(SECTIONS))
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10, 100, 1024, 10240], help="document sizes in KB")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per Python timing")
+    parser.add_argument("--updates", type=int, default=20, help="edits per browser update timing")
+    parser.add_argument("--no-browser", dest="browser", action="store_false", help="skip the headless browser metrics")
+    parser.add_argument("--output", type=Path, help="write the results JSON here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before a metric counts as a regression")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.update_baseline:
+        args.baseline.write_text(text + "\n")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, skipping comparison", file=sys.stderr)
+        return
+    regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['metric']}: {regression['baseline']} -> {regression['current']}",
+            file=sys.stderr,
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
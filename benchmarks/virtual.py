@@ -0,0 +1,98 @@
+"""
+DOM size, memory and layout cost of very long documents.
+
+Renders a log-plus-Markdown report of each size normally and with
+``virtual: true``, then scrolls through it. Reports DOM nodes, JS heap,
+render time and Chromium's layout time, which should stay flat with the
+virtualized renderer however long the document gets:
+
+    python benchmarks/virtual.py --sizes 1 5
+"""
+
+import argparse
+import json
+
+from harness import browser_page, cpu_probe, harness_html, serve
+
+SECTION = """## Run {index}
+
+Summary of run **{index}**: all checks passed, see the log below.
+
+```
+2024-01-01T00:00:00Z INFO  worker-{index} started
+2024-01-01T00:00:01Z INFO  worker-{index} processed 1000 items
+2024-01-01T00:00:02Z WARN  worker-{index} retrying request
+2024-01-01T00:00:03Z INFO  worker-{index} done
+```
+
+| metric | value |
+|--------|-------|
+| items  | {index} |
+
+"""
+
+RENDER_SCRIPT = """
+async ([size, virtual]) => {
+    const section = %s;
+    let doc = '';
+    for (let index = 0; doc.length < size; index++) doc += section.replaceAll('{index}', index);
+    const container = document.getElementById('report');
+    await window.ReflexMarkdown.loadMarked();
+    const started = performance.now();
+    await window.ReflexMarkdown.render(container, doc, { virtual });
+    container.getBoundingClientRect();
+    return performance.now() - started;
+}
+"""
+
+SCROLL_SCRIPT = """
+async (steps) => {
+    const frame = () => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    const height = document.documentElement.scrollHeight;
+    for (let step = 1; step <= steps; step++) {
+        window.scrollTo(0, height * step / steps);
+        await frame();
+    }
+    return height;
+}
+"""
+
+
+def measure(base_url: str, size: int, virtual: bool, steps: int) -> dict:
+    with browser_page() as page:
+        page.goto(base_url + "/virtual.html")
+        read = cpu_probe(page)
+        before = read()
+        render_ms = page.evaluate(RENDER_SCRIPT % json.dumps(SECTION), [size, virtual])
+        rendered = read()
+        scroll_height = page.evaluate(SCROLL_SCRIPT, steps)
+        after = read()
+    return {
+        "render_ms": round(render_ms, 1),
+        "dom_nodes": int(rendered["Nodes"]),
+        "js_heap_mb": round(rendered["JSHeapUsedSize"] / 2**20, 1),
+        "render_layout_ms": round((rendered["LayoutDuration"] - before["LayoutDuration"]) * 1000, 1),
+        "scroll_layout_ms": round((after["LayoutDuration"] - rendered["LayoutDuration"]) * 1000, 1),
+        "scroll_height_px": scroll_height,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5], help="document sizes in MB")
+    parser.add_argument("--scroll-steps", type=int, default=50)
+    args = parser.parse_args()
+
+    results = []
+    with serve({"/virtual.html": harness_html('<div class="rx-markdown" id="report"></div>')}) as base_url:
+        for size in args.sizes:
+            results.append({
+                "document_mb": size,
+                "full": measure(base_url, int(size * 2**20), False, args.scroll_steps),
+                "virtual": measure(base_url, int(size * 2**20), True, args.scroll_steps),
+            })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+First visit vs. warm reload of a long chat transcript.
+
+Loads a page with ``--messages`` rendered messages twice in the same browser
+profile. On the reload every message should come from the persistent render
+cache: the page paints without importing marked.js at all.
+
+    python benchmarks/warm_reload.py --messages 200
+"""
+
+import argparse
+import json
+
+from harness import browser_page, harness_html, serve
+
+MESSAGE = """**Assistant** — answer {index}
+
+Here is what changed in step {index}:
+
+1. the parser now handles `edge cases`
+2. tables render with alignment
+
+```python
+def step_{index}():
+    return "done"
+```
+"""
+
+
+def page_body(messages: int) -> str:
+    containers = "\n".join(f'<div class="rx-markdown" id="message-{i}"></div>' for i in range(messages))
+    documents = [MESSAGE.replace("{index}", str(i)) for i in range(messages)]
+    return f"""
+{containers}
+<script>
+const documents = {json.dumps(documents)};
+const started = performance.now();
+window.rendered = Promise.all(
+    documents.map((doc, index) => window.ReflexMarkdown.render(document.getElementById('message-' + index), doc))
+).then(() => performance.now() - started);
+</script>
+"""
+
+
+def visit(page) -> dict:
+    paint_ms = page.evaluate("window.rendered")
+    return {
+        "paint_ms": round(paint_ms, 1),
+        "marked_loaded": page.evaluate("Boolean(window.marked)"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+
+    with serve({"/transcript.html": harness_html(page_body(args.messages))}) as base_url, browser_page() as page:
+        page.goto(base_url + "/transcript.html")
+        first = visit(page)
+        # Let the cache writes land before reloading
+        page.wait_for_timeout(500)
+        page.reload()
+        warm = visit(page)
+    print(json.dumps({"messages": args.messages, "first_visit": first, "warm_reload": warm}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
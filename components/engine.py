@@ -0,0 +1,235 @@
+"""
+Server-side Markdown render engine.
+
+Renders GFM Markdown to HTML on the backend with mistune, using the same
+options the browser components pass to marked.js (``breaks`` and ``gfm``),
+and keeps the results in a process-wide LRU cache bounded by byte size.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
+import mistune
+
+from components import extensions
+from components.sanitize import DEFAULT_CUSTOM_TAGS, SanitizingRenderer
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """Options that change the rendered HTML (and therefore the cache key)."""
+    breaks: bool = True
+    gfm: bool = True
+    # Highlight fenced code with Pygments (see components.highlight);
+    # highlight_style is a Pygments style for inline colours instead of classes
+    highlight: bool = True
+    highlight_style: str | None = None
+    # Filter raw HTML through the allowlist sanitizer (see components.sanitize);
+    # custom_tags are allowed on top of its standard set
+    sanitize: bool = True
+    custom_tags: tuple[str, ...] = DEFAULT_CUSTOM_TAGS
+
+
+DEFAULT_OPTIONS = RenderOptions()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of the render cache counters."""
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class RenderCache:
+    """
+    LRU cache of rendered HTML bounded by the total size of the stored HTML.
+    Keys are ``(content digest, options)`` so equal documents share one entry.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached HTML for ``key`` or None, updating recency."""
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return html
+
+    def put(self, key, html: str):
+        """Store ``html`` under ``key``, evicting least recently used entries."""
+        size = len(html.encode("utf-8"))
+        if size > self.max_bytes:
+            # Never let a single huge document flush the whole cache
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.encode("utf-8"))
+            self._entries[key] = html
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.encode("utf-8"))
+                self._evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return the current hit/miss/eviction counters and size."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size,
+                max_bytes=self.max_bytes,
+            )
+
+
+render_cache = RenderCache(
+    max_bytes=int(os.environ.get("REFLEX_MARKDOWN_CACHE_BYTES", 32 * 1024 * 1024))
+)
+
+
+def content_digest(text: str) -> str:
+    """Return a stable digest of ``text`` (unlike ``hash()``, not salted per process)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _get_parser(options: RenderOptions):
+    """Build (once per option set) a mistune parser matching the marked.js setup."""
+    plugins = ["strikethrough", "table", "task_lists", "url"] if options.gfm else []
+    # Formula placeholders, like the marked extensions on the client
+    plugins.append(extensions.math)
+    custom_tags = options.custom_tags if options.sanitize else None
+    if options.highlight:
+        # Imported here: the highlighter caches through this module
+        from components.highlight import HighlightRenderer
+
+        renderer = HighlightRenderer(options.highlight_style, custom_tags)
+    else:
+        renderer = SanitizingRenderer(custom_tags)
+    return mistune.create_markdown(hard_wrap=options.breaks, renderer=renderer, plugins=plugins)
+
+
+def render_html(text: str, options: RenderOptions | None = None) -> str:
+    """
+    Render Markdown ``text`` to HTML, returning a cached result when the same
+    content has already been rendered with the same options in this process.
+    """
+    options = options or DEFAULT_OPTIONS
+    key = (content_digest(text), options)
+    html = render_cache.get(key)
+    if html is None:
+        html = _get_parser(options)(text)
+        render_cache.put(key, html)
+    return html
+
+
+_executor: Executor | None = None
+_executor_lock = threading.Lock()
+# (content digest, options) -> future of the render in progress
+_in_flight: dict[tuple, asyncio.Future] = {}
+
+
+def configure_executor(kind: str | None = None, max_workers: int | None = None) -> Executor:
+    """
+    Set the pool ``render_async`` renders in: "thread" (default) or "process"
+    (for CPU-heavy use, since rendering holds the GIL), with ``max_workers``
+    workers. Defaults come from the ``REFLEX_MARKDOWN_EXECUTOR`` and
+    ``REFLEX_MARKDOWN_WORKERS`` environment variables. Replaces, and shuts
+    down, any pool configured before.
+    """
+    global _executor
+    kind = kind or os.environ.get("REFLEX_MARKDOWN_EXECUTOR", "thread")
+    if max_workers is None and os.environ.get("REFLEX_MARKDOWN_WORKERS"):
+        max_workers = int(os.environ["REFLEX_MARKDOWN_WORKERS"])
+    if kind == "thread":
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="markdown-render")
+    elif kind == "process":
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        raise ValueError(f"unknown executor kind {kind!r} (expected 'thread' or 'process')")
+    with _executor_lock:
+        old, _executor = _executor, executor
+    if old is not None:
+        old.shutdown(wait=False)
+    return executor
+
+
+def _get_executor() -> Executor:
+    return _executor or configure_executor()
+
+
+def _render_uncached(text: str, options: RenderOptions) -> str:
+    # Runs in the pool; in a process pool the worker's own cache is useless,
+    # so the caller stores the result
+    return _get_parser(options)(text)
+
+
+async def render_async(
+    text: str, options: RenderOptions | None = None, timeout: float | None = None
+) -> str:
+    """
+    ``render_html`` for event handlers: a cache miss is rendered in the
+    pool set by ``configure_executor``, so a large document does not stall
+    the event loop (and every other client served by it). Concurrent calls
+    for the same content and options share one render. Raises
+    ``TimeoutError`` after ``timeout`` seconds; the render itself still
+    completes and fills the cache.
+    """
+    options = options or DEFAULT_OPTIONS
+    key = (content_digest(text), options)
+    html = render_cache.get(key)
+    if html is not None:
+        return html
+
+    loop = asyncio.get_running_loop()
+    future = _in_flight.get(key)
+    if future is None or future.get_loop() is not loop:
+        future = loop.run_in_executor(_get_executor(), _render_uncached, text, options)
+        _in_flight[key] = future
+
+        def finish(done: asyncio.Future):
+            if _in_flight.get(key) is done:
+                del _in_flight[key]
+            if not done.cancelled() and done.exception() is None:
+                render_cache.put(key, done.result())
+
+        future.add_done_callback(finish)
+
+    # Shielded: a waiter timing out or being cancelled leaves the shared render running
+    return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+
+def cache_stats() -> CacheStats:
+    """Return statistics for the shared render cache."""
+    return render_cache.stats()
@@ -0,0 +1,62 @@
+"""
+mistune counterparts of the marked extensions in ``assets/markdown/extensions.js``,
+so server-rendered HTML carries the same markup as the client's.
+
+Math: ``$…$`` / ``$$…$$`` inline and ``$$ … $$`` blocks become the runtime's
+placeholders holding the escaped TeX (``span.rx-math`` /
+``div.rx-math.rx-math-display``), typeset by the runtime's enhance step
+(see ``components.server_markdown``). The patterns match the client's, so
+"$5 and $10" stays text on both.
+"""
+
+import mistune
+
+# $$ on its own line(s): the whole block, up to a closing $$
+MATH_BLOCK = r"^ {0,3}\$\$(?P<rx_math_block>[\s\S]+?)\$\$[ \t]*(?:\n+|$)"
+# $tex$ or $$tex$$ inside a line; the TeX neither starts nor ends with a
+# space and the closing $ is not followed by a digit
+MATH_INLINE = (
+    r"(?P<rx_math_delimiter>\$\$?)(?![\s$])"
+    r"(?P<rx_math_text>(?:\\[\s\S]|[^\\\n$])+?)(?<!\s)(?P=rx_math_delimiter)(?![\d$])"
+)
+
+
+def math_html(tex: str, display: bool, block: bool) -> str:
+    """Placeholder for a formula, as ``mathHtml`` in extensions.js."""
+    tag = "div" if block else "span"
+    class_name = "rx-math rx-math-display" if display else "rx-math"
+    escaped = tex.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return f'<{tag} class="{class_name}">{escaped}</{tag}>' + ("\n" if block else "")
+
+
+def _parse_math_block(block, match, state):
+    tex = match.group("rx_math_block").strip()
+    if not tex:
+        return None
+    state.append_token({"type": "math_block", "raw": tex})
+    return match.end()
+
+
+def _parse_math_inline(inline, match, state):
+    display = len(match.group("rx_math_delimiter")) == 2
+    state.append_token({"type": "math_inline", "raw": match.group("rx_math_text"), "attrs": {"display": display}})
+    return match.end()
+
+
+def _render_math_block(renderer, tex: str) -> str:
+    return math_html(tex, True, True)
+
+
+def _render_math_inline(renderer, tex: str, display: bool) -> str:
+    return math_html(tex, display, False)
+
+
+def math(md: mistune.Markdown) -> None:
+    """mistune plugin for formulas, in blocks, block quotes and lists."""
+    md.block.register("math_block", MATH_BLOCK, _parse_math_block, before="list")
+    md.block.insert_rule(md.block.block_quote_rules, "math_block", before="list")
+    md.block.insert_rule(md.block.list_rules, "math_block", before="list")
+    md.inline.register("math_inline", MATH_INLINE, _parse_math_inline, before="codespan")
+    if md.renderer and md.renderer.NAME == "html":
+        md.renderer.register("math_block", _render_math_block)
+        md.renderer.register("math_inline", _render_math_inline)
@@ -0,0 +1,150 @@
+"""
+Server-side syntax highlighting for the render engine.
+
+Fenced code blocks are highlighted with Pygments while the HTML is rendered,
+so server-rendered pages carry static spans and the browser never loads a
+highlighter. By default tokens get the same ``hljs-*`` classes the client
+runtime produces, so the ``--rx-md-hl-*`` colours in the shared stylesheet
+apply to both; a Pygments style name emits inline colours instead.
+
+Highlighted blocks are cached per process by (lexer, style, code digest).
+"""
+
+import html
+import os
+from functools import lru_cache
+
+from pygments import highlight, lex
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+from pygments.token import Comment, Generic, Keyword, Literal, Name, Number, Operator, String
+from pygments.util import ClassNotFound
+
+from components.engine import RenderCache, content_digest
+from components.sanitize import DEFAULT_CUSTOM_TAGS, SanitizingRenderer
+
+# Larger blocks are left plain: Pygments is pure Python and lexes roughly
+# 400k characters a second, so this keeps any one block to about 50 ms
+MAX_HIGHLIGHT_CHARS = 20_000
+
+# Pygments token type -> highlight.js class (without the "hljs-" prefix);
+# subtypes fall back to their closest listed parent
+TOKEN_CLASSES = {
+    Keyword: "keyword",
+    Keyword.Constant: "literal",
+    Keyword.Type: "type",
+    Operator.Word: "keyword",
+    Name.Builtin: "built_in",
+    Name.Builtin.Pseudo: "variable",
+    Name.Function: "title",
+    Name.Class: "title",
+    Name.Decorator: "meta",
+    Name.Tag: "name",
+    Name.Attribute: "attr",
+    Name.Variable: "variable",
+    Name.Constant: "literal",
+    Literal: "literal",
+    String: "string",
+    String.Regex: "regexp",
+    Number: "number",
+    Comment: "comment",
+    Comment.Preproc: "meta",
+    Generic.Inserted: "addition",
+    Generic.Deleted: "deletion",
+    Generic.Heading: "section",
+    Generic.Subheading: "section",
+    Generic.Emph: "emphasis",
+    Generic.Strong: "strong",
+}
+
+highlight_cache = RenderCache(
+    max_bytes=int(os.environ.get("REFLEX_MARKDOWN_HIGHLIGHT_CACHE_BYTES", 8 * 1024 * 1024))
+)
+
+
+@lru_cache(maxsize=None)
+def _token_class(token_type) -> str | None:
+    while token_type is not None:
+        name = TOKEN_CLASSES.get(token_type)
+        if name:
+            return name
+        token_type = token_type.parent
+    return None
+
+
+@lru_cache(maxsize=256)
+def _get_lexer(language: str):
+    """Pygments lexer for a fence's language name, or None if there is none."""
+    try:
+        # Keep the code exactly as written, trailing newlines included
+        return get_lexer_by_name(language, stripnl=False, ensurenl=False)
+    except ClassNotFound:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _get_formatter(style: str) -> HtmlFormatter:
+    return HtmlFormatter(style=style, nowrap=True, noclasses=True)
+
+
+def _class_spans(lexer, code: str) -> str:
+    """Token spans with highlight.js classes, adjacent tokens of a class merged."""
+    parts = []
+    current = None
+    run = []
+
+    def flush():
+        text = html.escape("".join(run), quote=False)
+        parts.append(f'<span class="hljs-{current}">{text}</span>' if current else text)
+
+    for token_type, value in lex(code, lexer):
+        name = _token_class(token_type)
+        if name != current and run:
+            flush()
+            run = []
+        current = name
+        run.append(value)
+    if run:
+        flush()
+    return "".join(parts)
+
+
+def highlight_code(code: str, language: str, style: str | None = None) -> str | None:
+    """
+    Return the highlighted HTML (the inside of ``<code>``) of ``code``, or
+    None if there is no lexer for ``language`` or the block is too large.
+    ``style`` is a Pygments style name for inline colours; by default tokens
+    get ``hljs-*`` classes.
+    """
+    if len(code) > MAX_HIGHLIGHT_CHARS:
+        return None
+    lexer = _get_lexer(language.lower())
+    if lexer is None:
+        return None
+
+    key = (lexer.name, style, content_digest(code))
+    result = highlight_cache.get(key)
+    if result is None:
+        if style:
+            result = highlight(code, lexer, _get_formatter(style))
+        else:
+            result = _class_spans(lexer, code)
+        highlight_cache.put(key, result)
+    return result
+
+
+class HighlightRenderer(SanitizingRenderer):
+    """mistune HTML renderer that highlights fenced code with a known language."""
+
+    def __init__(self, style: str | None = None, custom_tags: tuple[str, ...] | None = DEFAULT_CUSTOM_TAGS):
+        super().__init__(custom_tags)
+        self.style = style
+
+    def block_code(self, code: str, info: str | None = None) -> str:
+        language = info.split(None, 1)[0] if info and info.strip() else None
+        highlighted = highlight_code(code, language, self.style) if language else None
+        if highlighted is None:
+            return super().block_code(code, info)
+        language = html.escape(language)
+        # "hljs" marks the block as done for the client runtime
+        return f'<pre><code class="language-{language} hljs">{highlighted}</code></pre>\n'
@@ -0,0 +1,231 @@
+"""
+Compact AST transport for server mode.
+
+Instead of an HTML string, the backend can send the rendered document as a
+small JSON tree that the browser turns straight into React elements: no
+Markdown parse, no HTML parse and no ``innerHTML`` replacement, and React
+reconciles updates so only changed elements are touched.
+
+The tree is built from the engine's HTML (so highlighting, sanitizing and
+custom tags behave exactly as in server mode) and encoded as
+
+    [AST_VERSION, tags, *nodes]
+
+where a node is either a text string or ``[tag index, *children]`` and
+``tags`` lists every distinct element once: a tag name, or ``[tag name,
+props]`` for elements with attributes. Interning whole elements keeps
+repeated ones such as highlighted ``<span class="hljs-keyword">`` down to a
+number. Props already use React names (``className``, ``colSpan``, style
+objects). Encoded trees are cached per process by content digest and
+options.
+"""
+
+import json
+import os
+import re
+from html.parser import HTMLParser
+
+import reflex as rx
+from reflex.vars.base import Var
+
+from components.engine import RenderCache, RenderOptions, content_digest, render_html
+from components.runtime import MARKDOWN_CLASS, queue_job
+
+AST_VERSION = 1
+
+ast_cache = RenderCache(
+    max_bytes=int(os.environ.get("REFLEX_MARKDOWN_AST_CACHE_BYTES", 32 * 1024 * 1024))
+)
+
+# Classes of the elements the runtime's enhance step finishes: formula
+# placeholders, and code blocks Pygments did not highlight (mermaid included)
+ENHANCED_CLASS = re.compile(r"^(?!(?:.*\s)?hljs(?:\s|$))(?:.*\s)?(?:rx-math|language-\S+)(?:\s|$)")
+VOID_TAGS = frozenset({"br", "col", "hr", "img", "input", "wbr"})
+# Whitespace between the children of these is not rendered (and React
+# rejects text inside table sections)
+BLOCK_CONTAINERS = frozenset({None, "ul", "ol", "dl", "table", "thead", "tbody", "tfoot", "tr", "colgroup"})
+# HTML attribute -> React prop
+PROP_NAMES = {
+    "class": "className",
+    "colspan": "colSpan",
+    "rowspan": "rowSpan",
+    "checked": "defaultChecked",
+    "datetime": "dateTime",
+}
+STYLE_DECLARATION = re.compile(r"\s*([\w-]+)\s*:\s*([^;]+)")
+
+
+def _style_object(style: str) -> dict[str, str]:
+    """``"font-weight: bold"`` -> ``{"fontWeight": "bold"}``."""
+    return {
+        re.sub(r"-(\w)", lambda match: match.group(1).upper(), name.lower()): value.strip()
+        for name, value in STYLE_DECLARATION.findall(style)
+    }
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags: list = []
+        self.tag_index: dict[str, int] = {}
+        self.root: list = []
+        # (tag, node) of the open elements, innermost last
+        self.stack: list[tuple[str | None, list]] = [(None, self.root)]
+
+    def _intern(self, tag: str, props: dict) -> int:
+        entry = [tag, props] if props else tag
+        key = json.dumps(entry, sort_keys=True)
+        index = self.tag_index.get(key)
+        if index is None:
+            index = self.tag_index[key] = len(self.tags)
+            self.tags.append(entry)
+        return index
+
+    def handle_starttag(self, tag, attrs):
+        props = {}
+        for name, value in attrs:
+            if name == "style":
+                props["style"] = _style_object(value or "")
+            else:
+                props[PROP_NAMES.get(name, name)] = True if value is None else value
+        node = [self._intern(tag, props)]
+        self.stack[-1][1].append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, node))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        # Close up to the matching element; stray end tags are ignored
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth][0] == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        parent_tag, parent = self.stack[-1]
+        if parent_tag in BLOCK_CONTAINERS and not data.strip():
+            return
+        if parent and isinstance(parent[-1], str):
+            parent[-1] += data
+        else:
+            parent.append(data)
+
+
+def encode_html(html: str) -> list:
+    """Encode rendered HTML as a compact AST (see the module docstring)."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return [AST_VERSION, builder.tags, *builder.root]
+
+
+def render_ast(text: str, options: RenderOptions | None = None) -> list:
+    """
+    Render Markdown ``text`` to a compact AST, returning a cached encoding
+    when the same content has already been rendered with the same options.
+    """
+    key = (content_digest(text), options)
+    encoded = ast_cache.get(key)
+    if encoded is None:
+        tree = encode_html(render_html(text, options))
+        ast_cache.put(key, json.dumps(tree, ensure_ascii=False, separators=(",", ":")))
+        return tree
+    return json.loads(encoded)
+
+
+# Turns an AST into React elements; memoized on the AST, so a parent
+# re-rendering with the same tree does nothing and a new tree is reconciled
+# by React against the previous one. Formula placeholders and code blocks
+# are finished by the runtime's enhance step, which rewrites them in place,
+# so they (and the <pre> around a code block) are keyed on their text: an
+# edited one is replaced rather than patched by React
+AST_RENDERER_CODE = f"""
+const RX_MARKDOWN_ENHANCED = {ENHANCED_CLASS.pattern!r};
+
+function rxMarkdownText(node) {{
+    if (typeof node === "string") return node;
+    let text = "";
+    for (let index = 1; index < node.length; index++) text += rxMarkdownText(node[index]);
+    return text;
+}}
+
+function rxMarkdownElement(node, key, tags, enhanced) {{
+    if (typeof node === "string") return node;
+    const entry = tags[node[0]];
+    const plain = typeof entry === "string";
+    const tag = plain ? entry : entry[0];
+    if (enhanced.has(node[0]) || (tag === "pre" && Array.isArray(node[1]) && enhanced.has(node[1][0]))) {{
+        key = `${{key}}:${{rxMarkdownText(node)}}`;
+    }}
+    const props = plain ? {{ key }} : {{ ...entry[1], key }};
+    if (node.length === 1) return createElement(tag, props);
+    const children = [];
+    for (let index = 1; index < node.length; index++) children.push(rxMarkdownElement(node[index], index, tags, enhanced));
+    return createElement(tag, props, children);
+}}
+
+function RxMarkdownAst({{ ast, ...props }}) {{
+    const ref = useRef(null);
+    const [children, enhanced] = useMemo(() => {{
+        if (!Array.isArray(ast) || ast[0] !== {AST_VERSION}) {{
+            if (ast) console.error("Unsupported Markdown AST version:", ast[0]);
+            return [null, false];
+        }}
+        const tags = ast[1];
+        const enhanced = new Set();
+        const pattern = new RegExp(RX_MARKDOWN_ENHANCED);
+        tags.forEach((entry, index) => {{
+            if (typeof entry !== "string" && pattern.test(entry[1].className || "")) enhanced.add(index);
+        }});
+        const elements = [];
+        for (let index = 2; index < ast.length; index++) elements.push(rxMarkdownElement(ast[index], index, tags, enhanced));
+        return [elements, enhanced.size > 0];
+    }}, [ast]);
+    useEffect(() => {{
+        if (!enhanced) return;
+        {queue_job("if (ref.current) md.enhance(ref.current);")}
+    }}, [ast]);
+    return createElement("div", {{ ...props, ref }}, children);
+}}
+"""
+
+
+class MarkdownAstView(rx.Component):
+    """Container rendering a compact Markdown AST as React elements."""
+
+    tag = "RxMarkdownAst"
+
+    # Encoded document (see encode_html)
+    ast: Var[list]
+
+    def add_imports(self):
+        return {"react": ["createElement", "useEffect", "useMemo", "useRef"]}
+
+    def add_custom_code(self) -> list[str]:
+        return [AST_RENDERER_CODE]
+
+
+def AstMarkdown(content, class_name: str = MARKDOWN_CLASS, **props) -> rx.Component:
+    """
+    Markdown component that sends a pre-parsed AST instead of HTML.
+
+    String content is encoded at compile time. A state Var is expected to
+    already hold the AST, typically a computed var:
+
+        @rx.var(cache=True)
+        def answer_ast(self) -> list:
+            return render_ast(self.answer)
+
+    Formulas, diagrams and code Pygments left unhighlighted are finished by
+    the client runtime's enhance step, as in server mode, so documents with
+    them need ``markdown_head`` on the page.
+    """
+    ast = content if isinstance(content, rx.Var) else render_ast(content or "")
+    return rx.box(
+        MarkdownAstView.create(ast=ast, class_name=class_name, **props),
+        width="100%"
+    )
@@ -0,0 +1,174 @@
+"""
+Markdown editor that syncs edits to the backend as text operations.
+
+Binding a text area to a state var sends the whole document on every
+keystroke and echoes it back. ``MarkdownEditor`` sends only what changed, as
+ops ``[offset, delete_count, insert]`` coalesced over a debounce interval, and
+patches a client-side preview with the same edits. The backend keeps the text
+in a backend-only var and applies the ops with ``apply_text_ops``:
+
+    class State(rx.State):
+        markdown_input: str = ""   # snapshot loaded into the editor
+        _markdown: str = ""
+
+        def load_markdown(self):
+            self.markdown_input = self._markdown
+
+        def apply_markdown_ops(self, ops: list, length: int, checksum: int):
+            try:
+                self._markdown = apply_text_ops(self._markdown, ops, length, checksum)
+            except ValueError:
+                # Our copy diverged (or the state was reset): fetch the full text
+                return resync_editor("markdown-editor", State.resync_markdown)
+
+        def resync_markdown(self, text: str | None):
+            if text is not None:
+                self._markdown = text
+
+    MarkdownEditor(State.markdown_input, on_ops=State.apply_markdown_ops, preview_id="preview")
+
+Offsets, counts and lengths are in UTF-16 code units, as the browser counts
+them.
+"""
+
+import json
+import zlib
+
+import reflex as rx
+from reflex.event import EventSpec, passthrough_event_spec
+from reflex.vars.base import LiteralVar, Var
+
+from components.runtime import queue_job
+
+# Milliseconds of edits coalesced into one message
+DEFAULT_DEBOUNCE = 300
+
+
+def apply_text_ops(text: str, ops: list, length: int | None = None, checksum: int | None = None) -> str:
+    """
+    Apply editor ops ``[offset, delete_count, insert]`` to ``text`` in order.
+    Offsets, counts and ``length`` are UTF-16 code units, like the browser's
+    string indices (an emoji counts as two); ``checksum`` is the CRC-32 of
+    the editor's text as UTF-16LE.
+
+    Raises ValueError for an op outside the text, or if the result is not
+    ``length`` units long or does not match ``checksum`` (the client's copy
+    and ours have diverged, even if a lost edit left the length unchanged).
+    """
+    units = bytearray(text.encode("utf-16-le", "surrogatepass"))
+    for offset, delete_count, insert in ops:
+        if not (0 <= offset and 0 <= delete_count and 2 * (offset + delete_count) <= len(units)):
+            raise ValueError(f"Edit [{offset}, {delete_count}] is outside the text ({len(units) // 2} units)")
+        units[2 * offset:2 * (offset + delete_count)] = insert.encode("utf-16-le", "surrogatepass")
+    if length is not None and len(units) // 2 != length:
+        raise ValueError(f"Edited text has {len(units) // 2} units, the editor has {length}")
+    if checksum is not None and zlib.crc32(units) != checksum:
+        raise ValueError("Edited text does not match the editor's checksum")
+    return units.decode("utf-16-le", "surrogatepass")
+
+
+def resync_editor(editor_id: str, callback) -> EventSpec:
+    """
+    Event fetching the full text of the editor with id ``editor_id`` into
+    ``callback`` (a handler taking ``text: str | None``), for when
+    ``apply_text_ops`` finds the backend's copy out of step. Edits the editor
+    has not sent yet are part of that text, so it drops them, and later ops
+    apply on top of it.
+    """
+    return rx.call_script(
+        f"window.ReflexMarkdown.resyncEditor({json.dumps(editor_id)})",
+        callback=callback,
+    )
+
+
+class MarkdownEditorArea(rx.el.Textarea):
+    """
+    Uncontrolled text area driven by the runtime's ``bindEditor``: its value
+    is only set from ``content``, and edits leave through ``on_ops``.
+    """
+
+    # Text loaded into the editor; the editor is reset whenever it changes
+    content: Var[str]
+
+    # Id of a Markdown container to keep rendered from the editor's text
+    preview_id: Var[str]
+
+    # Milliseconds of edits coalesced into one on_ops event
+    debounce: Var[int]
+
+    # Render the preview in the page's shared Web Worker
+    worker: Var[bool]
+
+    # Only keep the preview blocks near the viewport in the DOM
+    virtual: Var[bool]
+
+    # Fired with the coalesced ops, the resulting text length (UTF-16 units)
+    # and its checksum
+    on_ops: rx.EventHandler[passthrough_event_spec(list, int, int)]
+
+    def _exclude_props(self) -> list[str]:
+        # Consumed by the hooks, not DOM attributes
+        return ["content", "preview_id", "debounce", "worker", "virtual", "on_ops"]
+
+    def add_imports(self):
+        return {"react": ["useEffect", "useRef"]}
+
+    def add_hooks(self) -> list[str | Var]:
+        ref = self.get_ref()
+        content = self.content
+        send = LiteralVar.create(self.event_triggers.get("on_ops"))
+        preview = self.preview_id if self.preview_id is not None else "null"
+        debounce = self.debounce if self.debounce is not None else DEFAULT_DEBOUNCE
+        worker = self.worker if self.worker is not None else "false"
+        virtual = self.virtual if self.virtual is not None else "false"
+        bind = queue_job(
+            f"if (active) {ref}_editor.current = md.bindEditor({ref}.current, {{ "
+            f"preview: {preview}, debounce: {debounce}, worker: {worker}, virtual: {virtual}, "
+            f"send: (ops, length, checksum) => {ref}_send.current(ops, length, checksum) }});"
+        )
+        return [
+            f"const {ref}_editor = useRef(null);",
+            Var(
+                f"const {ref}_send = useRef(null); {ref}_send.current = {send};",
+                _var_data=send._get_all_var_data(),
+            ),
+            Var(
+                f"""useEffect(() => {{
+        let active = true;
+        {bind}
+        return () => {{
+            active = false;
+            if ({ref}_editor.current) {ref}_editor.current.stop();
+            {ref}_editor.current = null;
+        }};
+    }}, []);"""
+            ),
+            Var(
+                f"useEffect(() => {{ {queue_job(f'if ({ref}_editor.current) {ref}_editor.current.reset({content});')} }}, [{content}]);",
+                _var_data=content._get_all_var_data(),
+            ),
+        ]
+
+
+def MarkdownEditor(content, on_ops, preview_id: str | None = None,
+                   debounce: int = DEFAULT_DEBOUNCE, worker: bool = False, virtual: bool = False,
+                   **props) -> rx.Component:
+    """
+    Text area for Markdown whose edits reach ``on_ops`` (a handler taking
+    ``ops: list, length: int, checksum: int``) as coalesced text operations
+    rather than as the full text. ``content`` (a string or state Var) is the text it starts
+    from and is reset to; ``preview_id`` names the preview container to patch,
+    rendered with the ``worker`` and ``virtual`` options of the components.
+    """
+    # The runtime binds to the element through its ref, which needs an id
+    props.setdefault("id", "markdown-editor")
+    if preview_id is not None:
+        props["preview_id"] = preview_id
+    return MarkdownEditorArea.create(
+        content=content,
+        on_ops=on_ops,
+        debounce=debounce,
+        worker=worker,
+        virtual=virtual,
+        **props
+    )
@@ -0,0 +1,66 @@
+import reflex as rx
+from reflex.vars.base import Var
+
+from components.runtime import MARKDOWN_CLASS, MarkdownHost, markdown_id
+
+
+@rx.memo
+def markdown_item_template(
+    container_id: Var[str], content: Var[str], worker: Var[bool], virtual: Var[bool], lazy: Var[bool | str]
+) -> rx.Component:
+    """
+    One message of a MarkdownList. Its props are all primitives, so when the
+    list updates React.memo skips every message whose id and content did not
+    change; an options object built by the list would be new on each update.
+    """
+    return rx.box(
+        MarkdownHost.create(
+            id=container_id,
+            content=content,
+            options=Var.create({"worker": worker, "virtual": virtual, "lazy": lazy}),
+            class_name=MARKDOWN_CLASS,
+        ),
+        width="100%",
+    )
+
+
+def MarkdownList(
+    messages,
+    id_key: str = "id",
+    content_key: str = "content",
+    worker: bool = False,
+    virtual: bool = False,
+    lazy: bool | str = False,
+    **props
+) -> rx.Component:
+    """
+    Keyed list of Markdown messages, e.g. a chat history.
+
+    ``messages`` is a list Var of dicts holding a unique message id and its
+    Markdown source (under ``id_key`` and ``content_key``). Every message is a
+    memoized instance keyed by its id and rendered from an effect on its own
+    content, so appending a message renders just that message and an update
+    re-renders only the messages whose content changed. ``worker``,
+    ``virtual`` and ``lazy`` are passed to every message's render.
+    """
+    # One id per list; each message's container adds the message id to it
+    list_id = props.pop("id", None) or markdown_id(messages, prefix="markdown-list")
+
+    def message_item(message) -> rx.Component:
+        message_id = message[id_key].to(str)
+        return rx.fragment(
+            markdown_item_template(
+                container_id=f"{list_id}-" + message_id,
+                content=message[content_key].to(str),
+                worker=worker,
+                virtual=virtual,
+                lazy=lazy,
+            ),
+            key=message_id,
+        )
+
+    return rx.box(
+        rx.foreach(messages, message_item),
+        width="100%",
+        **props
+    )
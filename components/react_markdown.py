@@ -0,0 +1,110 @@
+import json
+
+import reflex as rx
+from reflex.vars.base import Var
+
+from components.runtime import MARKDOWN_CLASS
+from components.sanitize import DEFAULT_CUSTOM_TAGS
+from components.server_markdown import ServerMarkdown, resolve_mode
+
+# remark / rehype plugins matching the marked.js setup (gfm, breaks) plus
+# raw HTML support filtered by rehype-sanitize; versions for react-markdown 8
+PLUGIN_PACKAGES = {
+    "remarkGfm": "remark-gfm@^3.0.1",
+    "remarkBreaks": "remark-breaks@^3.0.3",
+    "rehypeRaw": "rehype-raw@^6.1.1",
+    "rehypeSanitize": "rehype-sanitize@^5.0.1",
+}
+
+# Module-level constants, so every render passes the same plugin, schema and
+# component objects and react-markdown sees unchanged props
+REACT_MARKDOWN_CODE = f"""
+const rxMarkdownSchema = {{
+    ...defaultSchema,
+    tagNames: [...defaultSchema.tagNames, ...{json.dumps(list(DEFAULT_CUSTOM_TAGS))}],
+}};
+const rxMarkdownRemarkPlugins = [remarkGfm, remarkBreaks];
+const rxMarkdownRehypePlugins = [rehypeRaw, [rehypeSanitize, rxMarkdownSchema]];
+const rxMarkdownComponents = {{
+    thinking: ({{ node, ...props }}) => createElement("div", {{ ...props, className: "rx-markdown-thinking" }}),
+}};
+"""
+
+
+class ReactMarkdownView(rx.Component):
+    """react-markdown with the plugins and element mapping above."""
+
+    library = "react-markdown@^8.0.7"
+
+    tag = "ReactMarkdown"
+
+    is_default = True
+
+    remark_plugins: Var[list]
+
+    rehype_plugins: Var[list]
+
+    components: Var[dict]
+
+    def add_imports(self):
+        imports = {
+            package: [rx.ImportVar(tag=name, is_default=True)]
+            for name, package in PLUGIN_PACKAGES.items()
+        }
+        imports[PLUGIN_PACKAGES["rehypeSanitize"]].append(rx.ImportVar(tag="defaultSchema"))
+        return {"react": ["createElement"], **imports}
+
+    def add_custom_code(self) -> list[str]:
+        return [REACT_MARKDOWN_CODE]
+
+
+@rx.memo
+def react_markdown_template(content: Var[str], class_name: Var[str]) -> rx.Component:
+    """
+    react-markdown in a container. As a memoized component it re-renders
+    (and re-parses) only when ``content`` or ``class_name`` change.
+    """
+    return rx.box(
+        ReactMarkdownView.create(
+            content,
+            remark_plugins=Var("rxMarkdownRemarkPlugins"),
+            rehype_plugins=Var("rxMarkdownRehypePlugins"),
+            components=Var("rxMarkdownComponents"),
+        ),
+        class_name=class_name,
+        width="100%",
+    )
+
+
+def ReactMarkdown(
+    content,
+    mode: str = "auto",
+    worker: bool = False,
+    virtual: bool = False,
+    lazy: bool | str = False,
+    **props
+) -> rx.Component:
+    """
+    Markdown rendered by react-markdown as a native React component, with
+    remark-gfm, line breaks and sanitized raw HTML (``<thinking>`` becomes a
+    styled block). React reconciles each update, so only the changed
+    elements are touched, and parents re-rendering with the same content
+    skip parsing entirely.
+
+    Takes the same arguments as the other components: mode="auto" renders
+    string content at compile time (like Markdown), "client" always uses
+    react-markdown. ``worker``, ``virtual`` and ``lazy`` belong to the
+    marked.js runtime and are accepted for compatibility; virtual=True only
+    keeps the content out of compile-time rendering.
+    """
+    if resolve_mode(mode, content, virtual) == "server":
+        return ServerMarkdown(content, class_name=MARKDOWN_CLASS, **props)
+
+    content = content if isinstance(content, rx.Var) else content or ""
+    if not props:
+        return react_markdown_template(content=content, class_name=MARKDOWN_CLASS)
+
+    return rx.box(
+        react_markdown_template(content=content, class_name=MARKDOWN_CLASS),
+        **props
+    )
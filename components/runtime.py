@@ -0,0 +1,505 @@
+"""
+Shared client-side assets for the Markdown components.
+
+The files live in ``assets/markdown`` and are served by Reflex as static,
+cacheable assets. URLs carry a content hash so browsers can cache them
+indefinitely and still pick up new versions.
+
+``assets/markdown/runtime.js`` is the client runtime every instance talks
+to; third-party libraries are vendored into ``assets/markdown/vendor`` by
+``scripts/vendor_assets.py``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import reflex as rx
+from reflex.plugins import CompileContext
+from reflex.vars.base import Var, VarData
+
+from components.engine import content_digest
+
+logger = logging.getLogger(__name__)
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets" / "markdown"
+# Third-party libraries downloaded by scripts/vendor_assets.py
+VENDOR_DIR = ASSETS_DIR / "vendor"
+
+# Class every Markdown container carries; all styling hangs off it
+MARKDOWN_CLASS = "rx-markdown"
+
+
+def asset_url(name: str) -> str:
+    """Return the versioned public URL of a file in ``assets/markdown``."""
+    path = ASSETS_DIR / name
+    try:
+        version = hashlib.blake2b(path.read_bytes(), digest_size=5).hexdigest()
+    except OSError:
+        return f"/markdown/{name}"
+    return f"/markdown/{name}?v={version}"
+
+
+STYLESHEET_URL = asset_url("markdown.css")
+RUNTIME_URL = asset_url("runtime.js")
+WORKER_URL = asset_url("worker.js")
+EXTENSIONS_URL = asset_url("extensions.js")
+
+def _vendored(path: str) -> bool:
+    """Whether ``path`` (relative to ``assets/markdown/vendor``) has been vendored."""
+    return (VENDOR_DIR / path).is_file()
+
+
+def _unvendored(library: str, path: str, cdn_url: str, explicit: bool) -> str:
+    """
+    Handle a "bundled" source whose vendored ``path`` is missing: the default
+    source falls back to ``cdn_url`` with a warning, while an explicitly
+    requested "bundled" source (offline deployments) raises.
+    """
+    message = (
+        f"{library} is not vendored (assets/markdown/vendor/{path} is missing); "
+        "run python scripts/vendor_assets.py and commit the result"
+    )
+    if explicit:
+        raise FileNotFoundError(message)
+    logger.warning("%s. Loading it from %s instead.", message, cdn_url)
+    return cdn_url
+
+
+MARKED_VERSION = "12.0.0"
+MARKED_CDN_URL = f"https://esm.sh/marked@{MARKED_VERSION}"
+MARKED_FILE = "marked.esm.js"
+
+
+def marked_url(source: str | None = None) -> str:
+    """
+    Resolve the URL the browser loads marked.js from.
+
+    ``source`` (default: the ``REFLEX_MARKDOWN_MARKED`` environment variable)
+    is "bundled" for the vendored copy served from our assets, "cdn" for
+    esm.sh, or any explicit ES module URL. While the vendored copy is missing
+    the default falls back to the CDN with a warning, and an explicit
+    "bundled" raises ``FileNotFoundError``.
+    """
+    source = source or os.environ.get("REFLEX_MARKDOWN_MARKED")
+    if source in (None, "bundled"):
+        if not _vendored(MARKED_FILE):
+            return _unvendored("marked.js", MARKED_FILE, MARKED_CDN_URL, explicit=source is not None)
+        return asset_url(f"vendor/{MARKED_FILE}")
+    if source == "cdn":
+        return MARKED_CDN_URL
+    return source
+
+
+HIGHLIGHT_VERSION = "11.9.0"
+HIGHLIGHT_CDN_URL = f"https://cdn.jsdelivr.net/npm/@highlightjs/cdn-assets@{HIGHLIGHT_VERSION}/es"
+# Versioned directory name, since a query string would not carry over to the
+# grammars imported from it
+HIGHLIGHT_DIR = f"highlight-{HIGHLIGHT_VERSION}"
+
+
+def highlight_url(source: str | None = None) -> str | None:
+    """
+    Resolve the directory the browser loads highlight.js from (``core.min.js``
+    plus ``languages/<name>.min.js``), or None to turn highlighting off.
+
+    ``source`` (default: the ``REFLEX_MARKDOWN_HIGHLIGHT`` environment
+    variable) is "bundled" for the vendored copy, "cdn" for jsDelivr, "off",
+    or any URL of such a directory. "bundled" handles a missing vendored copy
+    as ``marked_url`` does.
+    """
+    source = source or os.environ.get("REFLEX_MARKDOWN_HIGHLIGHT")
+    if source == "off":
+        return None
+    if source in (None, "bundled"):
+        if not _vendored(f"{HIGHLIGHT_DIR}/core.min.js"):
+            return _unvendored("highlight.js", f"{HIGHLIGHT_DIR}/core.min.js", HIGHLIGHT_CDN_URL, explicit=source is not None)
+        return f"/markdown/vendor/{HIGHLIGHT_DIR}"
+    if source == "cdn":
+        return HIGHLIGHT_CDN_URL
+    return source.rstrip("/")
+
+
+KATEX_VERSION = "0.16.9"
+KATEX_CDN_URL = f"https://cdn.jsdelivr.net/npm/katex@{KATEX_VERSION}/dist"
+# Versioned directory name, since the stylesheet's font URLs are relative
+KATEX_DIR = f"katex-{KATEX_VERSION}"
+
+
+def katex_url(source: str | None = None) -> str | None:
+    """
+    Resolve the directory the browser loads KaTeX from (``katex.mjs`` plus
+    ``katex.min.css`` and its fonts), or None to leave formulas as TeX.
+
+    ``source`` (default: the ``REFLEX_MARKDOWN_KATEX`` environment variable)
+    is "bundled" for the vendored copy, "cdn" for jsDelivr, "off", or any URL
+    of such a directory. "bundled" handles a missing vendored copy as
+    ``marked_url`` does.
+    """
+    source = source or os.environ.get("REFLEX_MARKDOWN_KATEX")
+    if source == "off":
+        return None
+    if source in (None, "bundled"):
+        if not _vendored(f"{KATEX_DIR}/katex.mjs"):
+            return _unvendored("KaTeX", f"{KATEX_DIR}/katex.mjs", KATEX_CDN_URL, explicit=source is not None)
+        return f"/markdown/vendor/{KATEX_DIR}"
+    if source == "cdn":
+        return KATEX_CDN_URL
+    return source.rstrip("/")
+
+
+MERMAID_VERSION = "10.9.0"
+MERMAID_CDN_URL = f"https://cdn.jsdelivr.net/npm/mermaid@{MERMAID_VERSION}/dist/mermaid.esm.min.mjs"
+# Versioned directory name, since the module imports its chunks relatively
+MERMAID_DIR = f"mermaid-{MERMAID_VERSION}"
+
+
+def mermaid_url(source: str | None = None) -> str | None:
+    """
+    Resolve the ES module URL the browser loads Mermaid from, or None to show
+    ``mermaid`` blocks as code.
+
+    ``source`` (default: the ``REFLEX_MARKDOWN_MERMAID`` environment variable)
+    is "bundled" for the vendored copy, "cdn" for jsDelivr, "off", or any ES
+    module URL. "bundled" handles a missing vendored copy as ``marked_url``
+    does.
+    """
+    source = source or os.environ.get("REFLEX_MARKDOWN_MERMAID")
+    if source == "off":
+        return None
+    if source in (None, "bundled"):
+        if not _vendored(f"{MERMAID_DIR}/mermaid.esm.min.mjs"):
+            return _unvendored("Mermaid", f"{MERMAID_DIR}/mermaid.esm.min.mjs", MERMAID_CDN_URL, explicit=source is not None)
+        return f"/markdown/vendor/{MERMAID_DIR}/mermaid.esm.min.mjs"
+    if source == "cdn":
+        return MERMAID_CDN_URL
+    return source
+
+
+def markdown_head(
+    marked: str | None = None,
+    cache_bytes: int | None = None,
+    lazy_margin: str | None = None,
+    highlight: str | None = None,
+    math: str | None = None,
+    mermaid: str | None = None,
+    sanitize: bool = True,
+    custom_tags: tuple[str, ...] | None = None,
+) -> list[rx.Component]:
+    """
+    Components to add once to ``rx.App(head_components=...)`` so every page
+    loads the shared Markdown assets. ``marked`` is passed to ``marked_url``,
+    ``highlight`` to ``highlight_url``, ``math`` to ``katex_url`` and
+    ``mermaid`` to ``mermaid_url``;
+    ``cache_bytes`` caps the browser's persistent render cache (0 disables
+    it, default 50 MiB); ``lazy_margin`` is how far outside the viewport
+    ``lazy=True`` instances start rendering (default "200px"). Rendered HTML
+    goes through the allowlist sanitizer unless ``sanitize`` is False;
+    ``custom_tags`` are the tags it allows on top of its standard set
+    (default: ``thinking``).
+    """
+    url = marked_url(marked)
+    attrs = {
+        "data-marked-url": url,
+        "data-worker-url": WORKER_URL,
+        "data-extensions-url": EXTENSIONS_URL,
+    }
+    highlight_dir = highlight_url(highlight)
+    if highlight_dir:
+        attrs["data-highlight-url"] = highlight_dir
+    katex_dir = katex_url(math)
+    if katex_dir:
+        attrs["data-katex-url"] = katex_dir
+    mermaid_module = mermaid_url(mermaid)
+    if mermaid_module:
+        attrs["data-mermaid-url"] = mermaid_module
+    if not sanitize:
+        attrs["data-sanitize"] = "off"
+    if custom_tags is not None:
+        attrs["data-custom-tags"] = ",".join(custom_tags)
+    if cache_bytes is not None:
+        attrs["data-cache-bytes"] = str(cache_bytes)
+    if lazy_margin is not None:
+        attrs["data-lazy-margin"] = lazy_margin
+    return [
+        rx.el.link(rel="stylesheet", href=STYLESHEET_URL),
+        # Start fetching the parser with the page instead of on first render
+        rx.el.link(rel="modulepreload", href=url, cross_origin="anonymous"),
+        rx.el.link(rel="modulepreload", href=EXTENSIONS_URL, cross_origin="anonymous"),
+        rx.script(src=RUNTIME_URL, custom_attrs=attrs),
+    ]
+
+
+# Instances created so far per content key, so that instances showing the
+# same content (or bound to the same Var) still get distinct ids. Counts are
+# per page: they start over for every page a compile evaluates, on top of
+# the instances created outside a compile (e.g. at import time), so an id
+# depends only on the instance's place on its page
+_import_counts: dict[str, int] = {}
+_page_counts: dict[str, int] = {}
+# (compile run, route) the page counts belong to
+_counted_page: tuple[CompileContext, str | None] | None = None
+_instance_lock = threading.Lock()
+
+
+def _current_page() -> tuple[CompileContext, str | None] | None:
+    """(compile run, route) of the page being evaluated, or None outside a compile."""
+    try:
+        context = CompileContext.get()
+    except LookupError:
+        return None
+    # Pages are evaluated in order, each joining compiled_pages once done
+    index = len(context.compiled_pages)
+    return context, context.pages[index].route if index < len(context.pages) else None
+
+
+def markdown_id(content, prefix: str = "markdown") -> str:
+    """
+    Return the container id of a new instance showing ``content`` (a string,
+    or a state Var keyed by its JavaScript expression).
+
+    The id is content-addressed, so unlike ``hash()`` (salted per process)
+    it is the same on every worker, every run and every recompile; the n-th
+    instance on a page with the same content gets a ``-n`` suffix.
+    """
+    global _counted_page
+    source = str(content) if isinstance(content, rx.Var) else (content or "")
+    key = f"{prefix}-{content_digest(source)[:16]}"
+    page = _current_page()
+    with _instance_lock:
+        if page is None:
+            counts = _import_counts
+        else:
+            if _counted_page is None or _counted_page[0] is not page[0] or _counted_page[1] != page[1]:
+                _counted_page = page
+                _page_counts.clear()
+                _page_counts.update(_import_counts)
+            counts = _page_counts
+        count = counts[key] = counts.get(key, 0) + 1
+    return key if count == 1 else f"{key}-{count}"
+
+
+def js_content(content) -> str:
+    """Return a JavaScript expression evaluating to ``content`` (a string or a state Var)."""
+    if isinstance(content, rx.Var):
+        return f"{content.to_string()}"
+    return json.dumps(content or "")
+
+
+def queue_job(statement: str) -> str:
+    """
+    Return JavaScript that runs ``statement`` with the shared runtime bound to
+    ``md``, queueing it if the runtime has not loaded yet. Jobs run in order.
+    """
+    return f"""(window.ReflexMarkdownQueue = window.ReflexMarkdownQueue || []).push((md) => {{
+        {statement}
+    }});"""
+
+
+@lru_cache(maxsize=None)
+def _options_json(**options) -> str | None:
+    """JSON of ``render_options(**options)``, or None when all are at their default."""
+    options = render_options(**options)
+    return json.dumps(options) if options else None
+
+
+def render_options(worker: bool = False, virtual: bool = False, lazy: bool | str = False) -> dict:
+    """
+    Options for the runtime's ``render``, leaving out those at their default:
+    ``worker`` parses in the page's shared Web Worker instead of the main
+    thread, ``virtual`` only keeps the blocks near the viewport in the DOM,
+    ``lazy`` waits until the container comes within the page's lazy margin
+    of the viewport (or within ``lazy`` itself, a root margin like "600px").
+    """
+    options = {"worker": worker, "virtual": virtual, "lazy": lazy}
+    return {name: value for name, value in options.items() if value}
+
+
+# Placeholders cut out of the render template; NUL never occurs in ids or JS
+_ID_SLOT = "\0id\0"
+_CONTENT_SLOT = "\0content\0"
+
+
+@lru_cache(maxsize=64)
+def _render_template(options_js: str | None) -> tuple[str, str, str]:
+    """
+    The static parts of a render job around the container id and the content,
+    built once per option set.
+    """
+    args = f"{_CONTENT_SLOT}, {options_js}" if options_js else _CONTENT_SLOT
+    template = queue_job(f"md.render(document.getElementById('{_ID_SLOT}'), {args});")
+    head, rest = template.split(_ID_SLOT)
+    middle, tail = rest.split(_CONTENT_SLOT)
+    return head, middle, tail
+
+
+def queue_render(container_id: str, content_js: str, options_js: str | None = None) -> str:
+    """
+    Return JavaScript that renders the ``content_js`` expression into
+    ``container_id`` through the shared runtime, passing the ``options_js``
+    expression as its options.
+    """
+    head, middle, tail = _render_template(options_js)
+    return f"{head}{container_id}{middle}{content_js}{tail}"
+
+
+def render_script(container_id: str, content, **options) -> str:
+    """
+    Return the inline script rendering ``content`` (a string or a state Var)
+    into ``container_id``; keyword arguments are ``render_options``.
+    """
+    return queue_render(container_id, js_content(content), _options_json(**options))
+
+class MarkdownHost(rx.el.Div):
+    """
+    Container that renders its ``content`` through the shared runtime from a
+    React effect, so it re-renders exactly when the content Var changes and
+    does no work at all in between.
+    """
+
+    # Markdown source; a state Var or a plain string
+    content: Var[str]
+
+    # Options for the runtime's render (see render_options)
+    options: Var[dict]
+
+    def _exclude_props(self) -> list[str]:
+        # Consumed by the effect, not DOM attributes
+        return ["content", "options"]
+
+    def add_imports(self):
+        return {"react": ["useEffect"]}
+
+    def add_hooks(self) -> list[str | Var]:
+        container_id = self.id
+        content = self.content
+        var_data = [content._get_all_var_data()]
+        if isinstance(container_id, Var):
+            # A prop of a memo template: splice the expression into the quoted id
+            var_data.append(container_id._get_all_var_data())
+            container_id = f"' + {container_id} + '"
+        options_js = str(self.options) if self.options is not None else None
+        return [
+            Var(
+                f"useEffect(() => {{ {queue_render(container_id, str(content), options_js)} }}, [{content}]);",
+                _var_data=VarData.merge(*var_data),
+            )
+        ]
+
+
+# Memoized templates for the common case of instances without extra props.
+# Each is compiled once into its own React component, so a page only carries
+# the id, content, class and options of every instance instead of a copy of
+# its whole component tree.
+
+
+@rx.memo
+def markdown_script_template(
+    container_id: Var[str], content: Var[str], class_name: Var[str], options: Var[dict]
+) -> rx.Component:
+    """Container rendered by an inline script (Markdown, WorkingMarkdown, SimpleMarkdown)."""
+    return rx.box(
+        rx.script(queue_render(container_id, js_content(content), js_content(options))),
+        rx.box(id=container_id, class_name=class_name),
+        width="100%",
+    )
+
+
+@rx.memo
+def dynamic_markdown_template(
+    container_id: Var[str], content: Var[str], class_name: Var[str], options: Var[dict]
+) -> rx.Component:
+    """Container followed by its render script (DynamicMarkdown)."""
+    return rx.fragment(
+        rx.box(id=container_id, class_name=class_name),
+        rx.script(queue_render(container_id, js_content(content), js_content(options))),
+    )
+
+
+@rx.memo
+def markdown_host_template(
+    container_id: Var[str], content: Var[str], class_name: Var[str], options: Var[dict]
+) -> rx.Component:
+    """``MarkdownHost`` container rendered from a React effect (ImprovedMarkdown)."""
+    return rx.box(
+        MarkdownHost.create(id=container_id, content=content, options=options, class_name=class_name),
+        width="100%",
+    )
+
+
+# The same trees for instances with extra props, which the templates do not take
+
+
+def _script_layout(container_id: str, content, class_name: str, options: dict, props: dict) -> rx.Component:
+    # The script text embeds the content, so for a state Var it re-runs on every change
+    return rx.box(
+        rx.script(render_script(container_id, content, **options)),
+        rx.box(id=container_id, class_name=class_name, **props),
+        width="100%",
+    )
+
+
+def _dynamic_layout(container_id: str, content, class_name: str, options: dict, props: dict) -> rx.Component:
+    return rx.fragment(
+        rx.box(id=container_id, class_name=class_name, **props),
+        rx.script(render_script(container_id, content, **options)),
+    )
+
+
+def _host_layout(container_id: str, content, class_name: str, options: dict, props: dict) -> rx.Component:
+    return rx.box(
+        MarkdownHost.create(id=container_id, content=content, options=options, class_name=class_name, **props),
+        width="100%",
+    )
+
+
+_PROPS_LAYOUTS = {
+    markdown_script_template: _script_layout,
+    dynamic_markdown_template: _dynamic_layout,
+    markdown_host_template: _host_layout,
+}
+
+
+def markdown_component(
+    content,
+    template,
+    prefix: str = "markdown",
+    class_name: str = MARKDOWN_CLASS,
+    mode: str = "auto",
+    worker: bool = False,
+    virtual: bool = False,
+    lazy: bool | str = False,
+    **props
+) -> rx.Component:
+    """
+    Build an instance of a Markdown component that renders through
+    ``template`` in the browser; ``prefix`` starts its container id.
+
+    mode="auto" renders string content to HTML at compile time (no client-side
+    JavaScript) and state Vars in the browser; "server" and "client" force
+    either. With worker=True the browser parses in a Web Worker, with
+    virtual=True only the blocks near the viewport are kept in the DOM, and
+    with lazy=True (or a root margin like "600px") parsing waits until the
+    container approaches the viewport. An ``id`` in ``props`` replaces the
+    content-addressed container id, e.g. for the ``preview_id`` of a
+    MarkdownEditor.
+    """
+    # Imported here: server_markdown depends on this module
+    from components.server_markdown import ServerMarkdown, resolve_mode
+
+    if not isinstance(content, rx.Var):
+        content = content or ""
+    container_id = props.pop("id") if "id" in props else markdown_id(content, prefix)
+
+    if resolve_mode(mode, content, virtual) == "server":
+        return ServerMarkdown(content, class_name=class_name, id=container_id, **props)
+
+    options = render_options(worker=worker, virtual=virtual, lazy=lazy)
+    if not props:
+        # Shared compiled template; only id, content and options differ per instance
+        return template(container_id=container_id, content=content, class_name=class_name, options=options)
+    return _PROPS_LAYOUTS[template](container_id, content, class_name, options, props)
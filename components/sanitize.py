@@ -0,0 +1,152 @@
+"""
+Allowlist HTML sanitizer for the render engine.
+
+Markdown may carry raw HTML, which mistune passes through untouched. The
+renderer below filters every raw HTML fragment with one regex pass: allowed
+tags are rebuilt with their allowed attributes, other tags are dropped
+(their text stays), comments and script-like elements are dropped with
+their content, and any other "<" is escaped. URL attributes must be
+relative or use a safe scheme. The rules match the client sanitizer in
+``assets/markdown/extensions.js``.
+
+Markdown's own output is safe by construction (mistune escapes text and
+checks link URLs), so only the raw fragments are filtered; highlighted code
+keeps its inline styles.
+"""
+
+import re
+
+import mistune
+
+BASE_TAGS = frozenset(
+    "a abbr b bdi bdo blockquote br caption cite code col colgroup dd del details dfn div dl dt em "
+    "figcaption figure h1 h2 h3 h4 h5 h6 hr i img input ins kbd li mark ol p pre q rp rt ruby s samp "
+    "small span strong sub summary sup table tbody td tfoot th thead tr u ul var wbr".split()
+)
+# Allowed on top of BASE_TAGS unless configured otherwise
+DEFAULT_CUSTOM_TAGS = ("thinking",)
+
+GLOBAL_ATTRIBUTES = frozenset({"class", "title", "lang", "dir"})
+TAG_ATTRIBUTES = {
+    "a": {"href", "name"},
+    "img": {"src", "alt", "width", "height"},
+    "input": {"type", "checked", "disabled"},
+    "ol": {"start", "reversed", "type"},
+    "li": {"value"},
+    "td": {"align", "colspan", "rowspan"},
+    "th": {"align", "colspan", "rowspan", "scope"},
+    "col": {"span"},
+    "colgroup": {"span"},
+    "details": {"open"},
+    "blockquote": {"cite"},
+    "q": {"cite"},
+    "del": {"cite", "datetime"},
+    "ins": {"cite", "datetime"},
+}
+URL_ATTRIBUTES = frozenset({"href", "src", "cite"})
+SAFE_SCHEMES = frozenset({"http:", "https:", "mailto:", "tel:"})
+SAFE_IMAGE_DATA = re.compile(r"data:image/(?:png|gif|jpe?g|webp|avif)[;,]", re.IGNORECASE)
+
+# The patterns only know ASCII letters and HTML's own whitespace, so that
+# Python's Unicode classes and case folding cannot make them differ from
+# the client's
+
+# A comment, a script-like element with its content, a tag, or a stray "<"
+HTML_TOKEN = re.compile(
+    r"<!--[\s\S]*?(?:-->|\Z)"
+    r"|<(script|style|iframe|object|embed|noscript|template|textarea|title|xmp|noembed|noframes|plaintext)"
+    r"(?![\w-])[\s\S]*?(?:</\1[\t\n\f\r ]*>|\Z)"
+    r"|<(/?)([a-zA-Z][\w-]*)((?:[\t\n\f\r ]+[^\t\n\f\r \"'>/=]+"
+    r"(?:[\t\n\f\r ]*=[\t\n\f\r ]*(?:\"[^\"]*\"|'[^']*'|[^\t\n\f\r \"'=<>`]+))?)*)[\t\n\f\r ]*/?>"
+    r"|<",
+    re.IGNORECASE | re.ASCII,
+)
+ATTRIBUTE = re.compile(
+    r"([^\t\n\f\r \"'>/=]+)"
+    r"(?:[\t\n\f\r ]*=[\t\n\f\r ]*(?:\"([^\"]*)\"|'([^']*)'|([^\t\n\f\r \"'=<>`]+)))?"
+)
+# Character references a scheme can be hidden behind, decoded as the client
+# does: numeric ones and the named colon, tab and newline (";" optional).
+# Others cannot produce a scheme character, so they are left as they are
+ENTITY = re.compile(r"&(?:#([0-9]+)|#x([0-9a-f]+)|(colon|tab|newline));?", re.IGNORECASE)
+# Browsers ignore control characters and whitespace inside a scheme
+URL_IGNORED = re.compile(r"[\x00-\x20\x7f]")
+URL_SCHEME_END = re.compile(r"[:/?#]")
+
+
+def _decode_entities(text: str) -> str:
+    def replace(match: re.Match) -> str:
+        decimal, hexadecimal, name = match.groups()
+        if name:
+            return ":" if name.lower() == "colon" else ""
+        code = int(decimal) if decimal else int(hexadecimal, 16)
+        return "\ufffd" if code > 0x10FFFF else chr(code)
+
+    return ENTITY.sub(replace, text)
+
+
+def _safe_url(value: str, name: str) -> bool:
+    url = URL_IGNORED.sub("", _decode_entities(value))
+    end = URL_SCHEME_END.search(url)
+    if end is None or end.group() != ":":
+        # Relative URL
+        return True
+    scheme = url[: end.end()].lower()
+    return scheme in SAFE_SCHEMES or (name == "src" and SAFE_IMAGE_DATA.match(url) is not None)
+
+
+def _clean_attributes(tag: str, source: str) -> str:
+    allowed = TAG_ATTRIBUTES.get(tag, ())
+    parts = []
+    for match in ATTRIBUTE.finditer(source):
+        name = match.group(1).lower()
+        if name not in GLOBAL_ATTRIBUTES and name not in allowed:
+            continue
+        value = next((group for group in match.group(2, 3, 4) if group is not None), None)
+        if value is None:
+            parts.append(f" {name}")
+        elif name not in URL_ATTRIBUTES or _safe_url(value, name):
+            parts.append(f' {name}="{value.replace(chr(34), "&quot;")}"')
+    return "".join(parts)
+
+
+def sanitize_html(text: str, custom_tags: tuple[str, ...] = DEFAULT_CUSTOM_TAGS) -> str:
+    """Filter ``text`` against the allowlist (the base tags plus ``custom_tags``)."""
+    tags = BASE_TAGS.union(tag.lower() for tag in custom_tags)
+
+    def replace(match: re.Match) -> str:
+        if match.group() == "<":
+            return "&lt;"
+        name = match.group(3)
+        if match.group(1) is not None or name is None:
+            return ""
+        tag = name.lower()
+        if tag not in tags:
+            return ""
+        if match.group(2):
+            return f"</{tag}>"
+        return f"<{tag}{_clean_attributes(tag, match.group(4))}>"
+
+    return HTML_TOKEN.sub(replace, text)
+
+
+class SanitizingRenderer(mistune.HTMLRenderer):
+    """
+    mistune HTML renderer that passes raw HTML through ``sanitize_html``, or
+    unfiltered when ``custom_tags`` is None.
+    """
+
+    def __init__(self, custom_tags: tuple[str, ...] | None = DEFAULT_CUSTOM_TAGS):
+        # escape=False keeps raw HTML such as <thinking> blocks, like the client
+        super().__init__(escape=False)
+        self.custom_tags = custom_tags
+
+    def block_html(self, html: str) -> str:
+        if self.custom_tags is None:
+            return super().block_html(html)
+        return sanitize_html(html, self.custom_tags) + "\n"
+
+    def inline_html(self, html: str) -> str:
+        if self.custom_tags is None:
+            return html
+        return sanitize_html(html, self.custom_tags)
@@ -0,0 +1,101 @@
+import re
+
+import reflex as rx
+from reflex.components.core.html import Html
+from reflex.vars.base import Var
+
+from components.engine import render_html
+from components.runtime import MARKDOWN_CLASS, markdown_id, queue_job
+
+
+EMPTY_HTML = '<p class="empty">暂无内容</p>'
+
+# Markup the client runtime finishes: formula placeholders, and code blocks
+# the server did not highlight (including mermaid diagrams)
+ENHANCED_MARKUP = re.compile(r'class="(?:rx-math|language-[^" ]+")')
+
+
+class EnhancedHtml(Html):
+    """
+    Pre-rendered HTML passed through the runtime's ``enhance`` step after it
+    changes, so formulas are typeset and diagrams drawn as in client mode.
+    """
+
+    # The inner HTML, which the effect is keyed on
+    html: Var[str]
+
+    @classmethod
+    def create(cls, html, **props):
+        return super().create(html, html=html, **props)
+
+    def _exclude_props(self) -> list[str]:
+        return ["html"]
+
+    def add_imports(self):
+        return {"react": ["useEffect"]}
+
+    def add_hooks(self) -> list[str | Var]:
+        ref = self.get_ref()
+        var_data = self.html._get_all_var_data()
+        # Static HTML never changes after mounting
+        deps = f"[{self.html}]" if var_data else "[]"
+        enhance = queue_job(f"if ({ref}.current) md.enhance({ref}.current);")
+        return [Var(f"useEffect(() => {{ {enhance} }}, {deps});", _var_data=var_data)]
+
+
+def resolve_mode(mode: str, content, virtual: bool = False) -> str:
+    """
+    Resolve a component's ``mode``: "auto" pre-renders content known at
+    compile time (a plain string) on the server and leaves state Vars, and
+    virtualized documents, to the browser.
+    """
+    if mode != "auto":
+        return mode
+    return "client" if isinstance(content, rx.Var) or virtual else "server"
+
+
+def ServerMarkdown(content=None, class_name: str = MARKDOWN_CLASS, html=None, **props) -> rx.Component:
+    """
+    Markdown component that sends pre-rendered HTML instead of raw Markdown.
+
+    String ``content`` is rendered by the backend engine (and cached per
+    process). State is passed as already rendered HTML through ``html``,
+    rendered off the event loop in an event handler:
+
+        async def set_answer(self, answer: str):
+            self.answer = answer
+            self.answer_html = await render_async(answer)
+
+        ServerMarkdown(html=State.answer_html)
+
+    A state Var as ``content`` is rejected: its raw value would be inserted
+    into the page as HTML without being rendered or sanitized.
+
+    HTML with formulas, diagrams or code the server left unhighlighted (and
+    any state Var) goes through the client runtime's enhance step, so it
+    needs ``markdown_head`` on the page; other HTML needs no JavaScript.
+    """
+    if isinstance(content, rx.Var):
+        raise TypeError(
+            "mode=\"server\" cannot render a state Var as Markdown; render it with "
+            "render_async() in an event handler, store the HTML in a state var and pass "
+            "that as ServerMarkdown(html=...), or use mode=\"client\""
+        )
+    if html is None:
+        if not (content or "").strip():
+            # Same placeholder as the client runtime
+            html = EMPTY_HTML
+        else:
+            html = render_html(content)
+
+    if isinstance(html, rx.Var) or ENHANCED_MARKUP.search(html):
+        # The effect finds the container through its ref, which needs an id
+        props.setdefault("id", markdown_id(html, prefix="server-markdown"))
+        view = EnhancedHtml.create(html, class_name=class_name, **props)
+    else:
+        view = rx.html(html, class_name=class_name, **props)
+
+    return rx.box(
+        view,
+        width="100%"
+    )
@@ -0,0 +1,112 @@
+"""
+Append-only Markdown for streamed (LLM) output.
+
+Instead of binding a growing state Var, which resends and re-parses the whole
+answer on every token, the backend pushes only the new text:
+
+    class ChatState(rx.State):
+        @rx.event
+        async def ask(self):
+            yield stream_reset("answer")
+            async for event in stream_events("answer", llm.stream(prompt)):
+                yield event
+
+    MarkdownStream("answer")
+
+The client re-parses only the last, still open block; finished blocks keep
+their DOM nodes.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterable, Iterable
+
+import reflex as rx
+from reflex.event import EventSpec
+
+from components.runtime import MARKDOWN_CLASS, queue_job
+
+# Seconds of tokens joined into one websocket message by stream_events
+DEFAULT_INTERVAL = 0.05
+
+
+def MarkdownStream(stream_id: str, **props) -> rx.Component:
+    """
+    Container for a stream of Markdown addressed by ``stream_id``, fed with
+    ``stream_append`` / ``stream_reset`` from event handlers.
+    """
+    return rx.box(
+        rx.box(
+            id=stream_id,
+            class_name=MARKDOWN_CLASS,
+            **props
+        ),
+        width="100%"
+    )
+
+
+def stream_append(stream_id: str, delta: str) -> EventSpec:
+    """Event appending ``delta`` to the stream rendered by ``MarkdownStream(stream_id)``."""
+    return rx.call_script(
+        queue_job(f"md.append(document.getElementById({json.dumps(stream_id)}), {json.dumps(delta)});")
+    )
+
+
+def stream_reset(stream_id: str, content: str = "") -> EventSpec:
+    """Event clearing the stream ``stream_id``, optionally starting it over from ``content``."""
+    return rx.call_script(
+        queue_job(f"md.reset(document.getElementById({json.dumps(stream_id)}), {json.dumps(content)});")
+    )
+
+
+async def stream_events(stream_id: str, chunks: AsyncIterable[str] | Iterable[str],
+                        interval: float = DEFAULT_INTERVAL):
+    """
+    Yield ``stream_append`` events for ``chunks`` (e.g. LLM tokens), joining
+    the chunks that arrive within ``interval`` seconds into one event.
+    Buffered text is flushed once ``interval`` has passed even if no further
+    chunk arrives, so a pause in the stream does not hold it back. A plain
+    iterable (such as a blocking SDK stream) is read in a worker thread, so
+    waiting for its next chunk does not stall the event loop.
+    """
+    async def iterate():
+        if isinstance(chunks, AsyncIterable):
+            async for chunk in chunks:
+                yield chunk
+        else:
+            items = iter(chunks)
+            done = object()
+            while (chunk := await asyncio.to_thread(next, items, done)) is not done:
+                yield chunk
+
+    iterator = iterate()
+    buffer = []
+    flushed = time.monotonic()
+    # Next chunk being awaited; kept across flushes, since cancelling it
+    # would close the iterator
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(iterator))
+            timeout = max(0.0, flushed + interval - time.monotonic()) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if done:
+                try:
+                    buffer.append(pending.result())
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+            now = time.monotonic()
+            if buffer and now - flushed >= interval:
+                yield stream_append(stream_id, "".join(buffer))
+                buffer.clear()
+                flushed = now
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+    if buffer:
+        yield stream_append(stream_id, "".join(buffer))
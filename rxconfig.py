@@ -4,7 +4,10 @@ config = rx.Config(
     app_name="static_test",
     frontend_packages=[
         "react-markdown@^8.0.7", 
-        "remark-gfm@^3.0.1"
+        "remark-gfm@^3.0.1",
+        "remark-breaks@^3.0.3",
+        "rehype-raw@^6.1.1",
+        "rehype-sanitize@^5.0.1"
     ],
     # Point to the static_test package module
     app_module="dynamic_test.dynamic_test"
@@ -1,9 +1,9 @@
 import reflex as rx
 from components.simple_markdown import SimpleMarkdown
+from components.markdown_editor import MarkdownEditor, apply_text_ops, resync_editor
+from components.runtime import markdown_head
 
-class State(rx.State):
-    """应用状态"""
-    markdown_input: str = """# Reflex Markdown 组件测试
+DEFAULT_MARKDOWN = """# Reflex Markdown 组件测试
 
 ## 功能特性
 - **实时预览**: 输入内容立即渲染
@@ -47,10 +47,30 @@ def hello_world():
 
 **试试修改左侧的内容，右侧会实时更新！**
 """
+
+class State(rx.State):
+    """应用状态"""
+    # 载入编辑器和预览的快照，只在页面加载时发送
+    markdown_input: str = DEFAULT_MARKDOWN
+    # 文档内容只保存在后端，编辑器发来的是增量操作
+    _markdown: str = DEFAULT_MARKDOWN
     
-    def update_markdown(self, value: str):
-        """更新markdown内容"""
-        self.markdown_input = value
+    def load_markdown(self):
+        """页面加载时把后端保存的内容发给编辑器"""
+        self.markdown_input = self._markdown
+
+    def apply_markdown_ops(self, ops: list, length: int, checksum: int):
+        """应用编辑器发来的增量修改"""
+        try:
+            self._markdown = apply_text_ops(self._markdown, ops, length, checksum)
+        except ValueError:
+            # 后端副本与编辑器不一致（例如后端状态被重置），向编辑器取回全文
+            return resync_editor("markdown-editor", State.resync_markdown)
+
+    def resync_markdown(self, text: str | None):
+        """用编辑器的全文替换后端副本"""
+        if text is not None:
+            self._markdown = text
 
 def index():
     """主页面 - 交互式markdown测试器"""
@@ -67,9 +87,10 @@ def index():
             # 左侧输入区域
             rx.box(
                 rx.heading("输入区域", size="4", margin_bottom="0.5rem"),
-                rx.text_area(
-                    value=State.markdown_input,
-                    on_change=State.update_markdown,
+                MarkdownEditor(
+                    State.markdown_input,
+                    on_ops=State.apply_markdown_ops,
+                    preview_id="markdown-preview",
                     placeholder="在这里输入 Markdown 文本...",
                     height="500px",
                     width="100%",
@@ -94,6 +115,7 @@ def index():
                 rx.box(
                     SimpleMarkdown(
                         content=State.markdown_input,
+                        id="markdown-preview",
                         padding="1rem",
                         border="1px solid var(--gray-4)",
                         border_radius="8px",
@@ -168,6 +190,7 @@ print("Hello World")
     )
 
 app = rx.App(
+    head_components=markdown_head(),
     theme=rx.theme(
         appearance="light",
         has_background=True,
@@ -176,5 +199,5 @@ app = rx.App(
     )
 )
 
-app.add_page(index, route="/", title="Markdown 测试器")
+app.add_page(index, route="/", title="Markdown 测试器", on_load=State.load_markdown)
 app.add_page(simple_test, route="/simple", title="简单测试")
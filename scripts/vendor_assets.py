@@ -0,0 +1,105 @@
+"""
+Download the third-party browser libraries used by the Markdown runtime into
+``assets/markdown/vendor`` so they are served from our own origin.
+
+Run from the repository root and commit the result:
+
+    python scripts/vendor_assets.py
+"""
+
+import io
+import sys
+import tarfile
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Versions and file names come from the runtime, so the URLs it emits always
+# match what was downloaded
+from components.runtime import (  # noqa: E402
+    HIGHLIGHT_DIR,
+    HIGHLIGHT_VERSION,
+    KATEX_DIR,
+    KATEX_VERSION,
+    MARKED_FILE,
+    MARKED_VERSION,
+    MERMAID_DIR,
+    MERMAID_VERSION,
+    VENDOR_DIR,
+)
+
+# Grammars served from our origin; other languages stay unhighlighted unless
+# the runtime is pointed at the CDN (markdown_head(highlight="cdn"))
+HIGHLIGHT_LANGUAGES = [
+    "bash", "c", "cpp", "csharp", "css", "diff", "go", "java", "javascript",
+    "json", "kotlin", "markdown", "php", "plaintext", "powershell", "python",
+    "ruby", "rust", "scss", "sql", "swift", "typescript", "xml", "yaml",
+]
+
+# npm package -> (version, {path inside the package tarball: vendored file name});
+# a path ending in "/" copies the whole directory
+PACKAGES = {
+    "marked": (MARKED_VERSION, {
+        "package/lib/marked.esm.js": MARKED_FILE,
+        "package/LICENSE.md": "marked.LICENSE.md",
+    }),
+    "@highlightjs/cdn-assets": (HIGHLIGHT_VERSION, {
+        "package/es/core.min.js": f"{HIGHLIGHT_DIR}/core.min.js",
+        "package/LICENSE": f"{HIGHLIGHT_DIR}/LICENSE",
+        **{
+            f"package/es/languages/{language}.min.js": f"{HIGHLIGHT_DIR}/languages/{language}.min.js"
+            for language in HIGHLIGHT_LANGUAGES
+        },
+    }),
+    "katex": (KATEX_VERSION, {
+        "package/dist/katex.mjs": f"{KATEX_DIR}/katex.mjs",
+        "package/dist/katex.min.css": f"{KATEX_DIR}/katex.min.css",
+        "package/dist/fonts/": f"{KATEX_DIR}/fonts/",
+        "package/LICENSE": f"{KATEX_DIR}/LICENSE",
+    }),
+    "mermaid": (MERMAID_VERSION, {
+        "package/dist/mermaid.esm.min.mjs": f"{MERMAID_DIR}/mermaid.esm.min.mjs",
+        "package/dist/chunks/mermaid.esm.min/": f"{MERMAID_DIR}/chunks/mermaid.esm.min/",
+        "package/LICENSE": f"{MERMAID_DIR}/LICENSE",
+    }),
+}
+
+
+def fetch_package(name: str, version: str, files: dict[str, str]):
+    """Download one npm tarball and extract the requested files."""
+    url = f"https://registry.npmjs.org/{name}/-/{name.split('/')[-1]}-{version}.tgz"
+    print(f"Downloading {name}@{version}")
+    with urllib.request.urlopen(url) as response:
+        data = response.read()
+
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+        for member_name, target_name in files.items():
+            if member_name.endswith("/"):
+                members = {
+                    path: target_name + path[len(member_name):]
+                    for path in archive.getnames()
+                    if path.startswith(member_name) and archive.getmember(path).isfile()
+                }
+                if not members:
+                    raise FileNotFoundError(f"{member_name} not found in {name}@{version}")
+            else:
+                members = {member_name: target_name}
+            for path, target_path in members.items():
+                member = archive.extractfile(path)
+                if member is None:
+                    raise FileNotFoundError(f"{path} not found in {name}@{version}")
+                target = VENDOR_DIR / target_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(member.read())
+                print(f"  -> {target.relative_to(VENDOR_DIR.parent.parent.parent)}")
+
+
+def main():
+    for name, (version, files) in PACKAGES.items():
+        fetch_package(name, version, files)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import reflex as rx
 from components.simple_markdown import SimpleMarkdown
+from components.runtime import markdown_head
 
 def simple_test_page():
     """简单的静态测试页面"""
@@ -83,6 +84,7 @@ def hello_world():
 
 # 创建简单的应用
 app = rx.App(
+    head_components=markdown_head(),
     theme=rx.theme(
         appearance="light",
         has_background=True,
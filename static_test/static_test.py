@@ -1,5 +1,6 @@
 import reflex as rx
 from components.working_markdown import WorkingMarkdown
+from components.runtime import markdown_head
 
 def static_test_page():
     """静态测试页面 - 不使用状态变量"""
@@ -89,6 +90,7 @@ def hello_world():
 
 # 创建应用
 app = rx.App(
+    head_components=markdown_head(),
     theme=rx.theme(
         appearance="light",
         has_background=True,
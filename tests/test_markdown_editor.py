@@ -0,0 +1,136 @@
+"""
+``apply_text_ops`` against the ops the client runtime's ``bindEditor`` sends:
+UTF-16 offsets, rejected ops, and the length / checksum checks that make the
+backend ask for a resync.
+"""
+
+import json
+import shutil
+import subprocess
+import zlib
+from pathlib import Path
+
+import pytest
+import reflex as rx
+
+from components.markdown_editor import apply_text_ops, resync_editor
+
+RUNTIME_JS = Path(__file__).resolve().parent.parent / "assets" / "markdown" / "runtime.js"
+
+# Loads the runtime without a page and types into a fake text area: the
+# edits are random replacements (mixing ASCII, CJK and surrogate pairs)
+# flushed in batches, and the script prints the start text, every batch
+# sent and the final text
+EDITOR_SCRIPT = """
+import { readFileSync } from 'node:fs';
+globalThis.window = globalThis;
+globalThis.document = { currentScript: null, querySelector: () => null, getElementById: () => null };
+new Function(readFileSync(%(runtime)s, 'utf8'))();
+
+let seed = %(seed)d;
+const random = (n) => { seed = (seed * 1103515245 + 12345) %% 2147483648; return seed %% n; };
+const pieces = ['a', 'bc', ' ', '\\n', '中文', '😀', '👍🏽', '𝔘'];
+
+const listeners = {};
+const textarea = {
+    value: 'start 😀 text',
+    addEventListener: (type, listener) => { listeners[type] = listener; },
+    removeEventListener() {},
+};
+const start = textarea.value;
+const batches = [];
+window.ReflexMarkdown.bindEditor(textarea, { debounce: 0, send: (...batch) => batches.push(batch) });
+for (let step = 0; step < 400; step++) {
+    const text = textarea.value;
+    const at = random(text.length + 1);
+    const end = Math.min(text.length, at + random(4));
+    let insert = '';
+    for (let count = random(3); count > 0; count--) insert += pieces[random(pieces.length)];
+    textarea.value = text.slice(0, at) + insert + text.slice(end);
+    listeners.input();
+    if (random(5) === 0) listeners.blur();
+}
+listeners.blur();
+process.stdout.write(JSON.stringify({ start, batches, end: textarea.value }));
+"""
+
+
+def run_editor(seed: int) -> dict:
+    script = EDITOR_SCRIPT % {"runtime": json.dumps(str(RUNTIME_JS)), "seed": seed}
+    result = subprocess.run(
+        ["node", "--input-type=module", "-e", script],
+        capture_output=True, check=True,
+    )
+    # surrogatepass: an edit may leave a lone surrogate in the text for a while
+    return json.loads(result.stdout.decode("utf-8", "surrogatepass"))
+
+
+def checksum(text: str) -> int:
+    return zlib.crc32(text.encode("utf-16-le", "surrogatepass"))
+
+
+def test_offsets_are_utf16_units():
+    # "😀" is two units, so "b" is at offset 3
+    assert apply_text_ops("a😀b", [[3, 1, "c"]], 4) == "a😀c"
+    assert apply_text_ops("a😀b", [[1, 2, ""]], 2) == "ab"
+    assert apply_text_ops("a😀b", [[1, 0, "👍"]], 6) == "a👍😀b"
+
+
+def test_split_surrogate_pair_recombines():
+    # One op replaces half of a pair, the next restores it
+    text = apply_text_ops("😀", [[1, 1, "x"], [1, 1, "\ude00"]])
+    assert text == "😀"
+
+
+def test_rejects_ops_outside_the_text():
+    for op in ([-1, 0, "x"], [5, 0, "x"], [2, 2, ""], [0, -1, ""]):
+        with pytest.raises(ValueError):
+            apply_text_ops("a😀", [op])
+
+
+def test_length_mismatch_raises():
+    with pytest.raises(ValueError):
+        apply_text_ops("hello", [[5, 0, "!"]], length=5)
+
+
+def test_checksum_catches_lost_edit_of_same_length():
+    # A batch replacing "world" with "there" was lost: the next batch's
+    # length still matches, only the checksum tells the copies apart
+    client = "hello there!"
+    with pytest.raises(ValueError):
+        apply_text_ops("hello world", [[11, 0, "!"]], len(client), checksum(client))
+    assert apply_text_ops("hello there", [[11, 0, "!"]], len(client), checksum(client)) == client
+
+
+def test_resync_editor_fetches_the_editor_text():
+    class EditorState(rx.State):
+        _markdown: str = ""
+
+        def resync_markdown(self, text: str | None):
+            if text is not None:
+                self._markdown = text
+
+    spec = resync_editor("markdown-editor", EditorState.resync_markdown)
+    assert 'window.ReflexMarkdown.resyncEditor("markdown-editor")' in str(spec.args)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_client_ops_replay_on_the_backend(seed):
+    session = run_editor(seed)
+    text = session["start"]
+    for ops, length, digest in session["batches"]:
+        text = apply_text_ops(text, ops, length, digest)
+    assert text == session["end"]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_lost_batch_is_detected():
+    session = run_editor(4)
+    batches = session["batches"]
+    for lost in range(len(batches) - 1):
+        text = session["start"]
+        with pytest.raises(ValueError):
+            for index, (ops, length, digest) in enumerate(batches):
+                if index != lost:
+                    text = apply_text_ops(text, ops, length, digest)
@@ -0,0 +1,180 @@
+"""
+The server (components/sanitize.py) and client (assets/markdown/extensions.js)
+sanitizers must agree: every vector below is run through both, which must
+return the same, safe HTML.
+"""
+
+import html
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from components.sanitize import (
+    BASE_TAGS,
+    DEFAULT_CUSTOM_TAGS,
+    GLOBAL_ATTRIBUTES,
+    SAFE_IMAGE_DATA,
+    SAFE_SCHEMES,
+    TAG_ATTRIBUTES,
+    URL_ATTRIBUTES,
+    sanitize_html,
+)
+
+EXTENSIONS_JS = Path(__file__).resolve().parent.parent / "assets" / "markdown" / "extensions.js"
+
+CORPUS = [
+    # Plain markup
+    "plain text",
+    "<b>bold</b> and <i>italic</i>",
+    '<a href="https://example.com" title="x">link</a>',
+    '<a href="/relative/path?q=1#frag">relative</a>',
+    '<a href="mailto:someone@example.com">mail</a>',
+    '<img src="data:image/png;base64,AAAA" alt="pixel">',
+    "<table><tr><td colspan=2 align=left>cell</td></tr></table>",
+    '<input type="checkbox" checked disabled> done',
+    "<details open><summary>more</summary>hidden</details>",
+    "1 < 2 and 3 > 2",
+    # Script-like elements and comments
+    "<script>alert(1)</script>after",
+    "<SCRIPT SRC=//evil.example/x.js></SCRIPT>",
+    "<script>alert(1)",
+    "<style>body{display:none}</style>text",
+    "<iframe src=javascript:alert(1)></iframe>",
+    "<textarea><img src=x onerror=alert(1)></textarea>",
+    "<noscript><p title=\"</noscript><img src=x onerror=alert(1)>\"></noscript>",
+    "<!-- comment --><b>kept</b>",
+    "<!-- unterminated comment <script>alert(1)</script>",
+    "<template><img src=x onerror=alert(1)></template>",
+    "<plaintext><b>x</b>",
+    # Event handlers and other attributes
+    "<img src=x onerror=alert(1)>",
+    "<img src=x ONERROR=alert(1)>",
+    '<b onclick="alert(1)" class="c">x</b>',
+    "<b/onclick=alert(1)>x</b>",
+    '<a href="https://example.com" onmouseover=alert(1)>x</a>',
+    '<div style="background:url(javascript:alert(1))">x</div>',
+    '<p id="x" data-x="1">x</p>',
+    '<b title=\'a"b\'>quote</b>',
+    # Dangerous URLs, including entity- and whitespace-obfuscated schemes
+    '<a href="javascript:alert(1)">x</a>',
+    '<a href="JaVaScRiPt:alert(1)">x</a>',
+    '<a href=" javascript:alert(1)">x</a>',
+    '<a href="java\tscript:alert(1)">x</a>',
+    '<a href="java&#x09;script:alert(1)">x</a>',
+    '<a href="java&Tab;script:alert(1)">x</a>',
+    '<a href="javascript&colon;alert(1)">x</a>',
+    '<a href="&#106;avascript:alert(1)">x</a>',
+    '<a href="&#x6A;avascript:alert(1)">x</a>',
+    '<a href="&#0000106&#0000097vascript:alert(1)">x</a>',
+    '<a href="jav&#x0A;ascript:alert(1)">x</a>',
+    '<a href="javascript&colon alert(1)">x</a>',
+    '<a href="javascript&COLON;alert(1)">x</a>',
+    '<a href="java&NewLine;script:alert(1)">x</a>',
+    '<a href="java&#0;script:alert(1)">x</a>',
+    '<a href="java&sol;script:alert(1)">x</a>',
+    '<a href="&#x110000;javascript:alert(1)">x</a>',
+    '<a href="vbscript:msgbox(1)">x</a>',
+    '<a href="data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==">x</a>',
+    '<img src="data:image/svg+xml;base64,PHN2ZyBvbmxvYWQ9YWxlcnQoMSk+">',
+    '<img src="data:text/html,<script>alert(1)</script>">',
+    '<blockquote cite="javascript:alert(1)">x</blockquote>',
+    # SVG and MathML
+    "<svg onload=alert(1)>",
+    "<svg><script>alert(1)</script></svg>",
+    '<svg><a xlink:href="javascript:alert(1)"><text>x</text></a></svg>',
+    "<math><mtext><img src=x onerror=alert(1)></mtext></math>",
+    # Non-ASCII whitespace and letters, which HTML does not treat as such
+    "<b\u00a0onclick=alert(1)>x</b>",
+    "<b\x1conclick=alert(1)>x</b>",
+    "<b\u2028title=x>x</b>",
+    "<\u017fcript>alert(1)</\u017fcript>",
+    "<\u0130mg src=x onerror=alert(1)>",
+    "<a\u00e9 href=javascript:alert(1)>x",
+    # Unterminated and malformed tags
+    "<img src=x onerror=alert(1)",
+    "<a href='javascript:alert(1)' ",
+    "<b>unclosed",
+    "</b>stray end",
+    "<<b>>x",
+    "<b <i>x</i>",
+    "< b>not a tag",
+    "<3 and <=",
+    # Custom tags
+    "<thinking>hidden reasoning</thinking>answer",
+    "<THINKING class=\"t\" onclick=alert(1)>x</THINKING>",
+    "<thinking-extra>x</thinking-extra>",
+]
+
+TAG = re.compile(r'<(/?)([a-z][\w-]*)((?: [a-z-]+(?:="[^"]*")?)*)>')
+OUTPUT_ATTRIBUTE = re.compile(r' ([a-z-]+)(?:="([^"]*)")?')
+
+
+def run_client_sanitizer(texts: list[str], tmp_path: Path) -> list[str]:
+    # extensions.js is an ES module; node only loads it as one by extension
+    module = tmp_path / "extensions.mjs"
+    module.write_text(EXTENSIONS_JS.read_text(encoding="utf-8"), encoding="utf-8")
+    script = (
+        f"import {{ createSanitizer }} from {json.dumps(module.as_uri())};\n"
+        f"const sanitize = createSanitizer({json.dumps(list(DEFAULT_CUSTOM_TAGS))});\n"
+        "let input = '';\n"
+        "process.stdin.on('data', (chunk) => { input += chunk; });\n"
+        "process.stdin.on('end', () => process.stdout.write(JSON.stringify(JSON.parse(input).map(sanitize))));\n"
+    )
+    result = subprocess.run(
+        ["node", "--input-type=module", "-e", script],
+        input=json.dumps(texts), capture_output=True, text=True, encoding="utf-8", check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def assert_safe(output: str):
+    """Every "<" left in ``output`` starts an allowed tag with allowed, safe attributes."""
+    position = 0
+    for match in TAG.finditer(output):
+        assert "<" not in output[position:match.start()], output
+        position = match.end()
+        closing, tag, attributes = match.groups()
+        assert tag in BASE_TAGS or tag in DEFAULT_CUSTOM_TAGS, output
+        if closing:
+            assert not attributes, output
+        for name, value in OUTPUT_ATTRIBUTE.findall(attributes):
+            assert name in GLOBAL_ATTRIBUTES or name in TAG_ATTRIBUTES.get(tag, ()), output
+            if name in URL_ATTRIBUTES:
+                url = re.sub(r"[\x00-\x20\x7f]", "", html.unescape(value))
+                scheme = re.match(r"[^:/?#]*:", url)
+                assert (
+                    scheme is None
+                    or scheme.group().lower() in SAFE_SCHEMES
+                    or (name == "src" and SAFE_IMAGE_DATA.match(url))
+                ), output
+    assert "<" not in output[position:], output
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_server_output_is_safe(text):
+    assert_safe(sanitize_html(text))
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_client_matches_server(tmp_path):
+    client = run_client_sanitizer(CORPUS, tmp_path)
+    mismatches = [
+        (text, server, browser)
+        for text, server, browser in zip(CORPUS, map(sanitize_html, CORPUS), client)
+        if server != browser
+    ]
+    assert not mismatches
+
+
+def test_examples():
+    assert sanitize_html("<img src=x onerror=alert(1)>") == '<img src="x">'
+    assert sanitize_html('<a href="java&#x09;script:alert(1)">x</a>') == "<a>x</a>"
+    assert sanitize_html("<script>alert(1)</script>after") == "after"
+    assert sanitize_html("<svg onload=alert(1)>x") == "x"
+    assert sanitize_html("<img src=x onerror=alert(1)") == "&lt;img src=x onerror=alert(1)"
+    assert sanitize_html("<thinking>x</thinking>") == "<thinking>x</thinking>"
+    assert sanitize_html("<thinking>x</thinking>", custom_tags=()) == "x"